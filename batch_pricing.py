@@ -0,0 +1,245 @@
+import argparse
+import io
+import os
+import time
+
+import numpy as np
+
+from binomial_tree import binomial_tree_american_batch
+from black_sholes import black_scholes_batch
+from credit_derivative_pricing import HazardCurve, price_cds_batch
+from interest_rate_derivative_pricing import YieldCurve, price_caps_floors, price_swaps
+from stochastic_vol_model import heston_price_cos
+from verbosity import quiet
+
+# =================== TRADE FILES ===================
+# A trade file is columnar: one row per trade, a 'model' column and the union
+# of the models' input columns (blank / NaN where a column does not apply).
+#
+#   black_scholes  S, K, T, r, sigma            [q=0, option_type=call]
+#   american       S, K, T, r, sigma            [option_type=call, steps=100]
+#   heston         S, K, T, r, v0, kappa, theta, vol_of_vol, rho   [q=0, option_type=call]
+#   swap           notional, fixed_rate, maturity, rate            [payments_per_year=2, payer=1]
+#   cap / floor    notional, strike, maturity, sigma, rate         [payments_per_year=4]
+#   cds            notional, maturity, rate, hazard_rate           [recovery_rate=0.4, spread=0, payments_per_year=4]
+#
+# T and maturity are in years; rate is the flat continuously compounded
+# discount rate (trades with the same rate share one curve).
+
+TEXT_COLUMNS = ("model", "option_type")
+RESULT_DTYPE = [("trade", "i8"), ("model", "U16"), ("price", "f8"), ("delta", "f8"), ("gamma", "f8"),
+                ("vega", "f8"), ("fair_rate", "f8")]
+
+def read_trades(path):
+    """Loads a .csv, .npy or .parquet trade file as {column: array}."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        data = np.load(path, allow_pickle=False)
+        return {name: data[name] for name in data.dtype.names}
+    if ext == ".parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+        return {name: table.column(name).to_numpy(zero_copy_only=False) for name in table.column_names}
+    if ext == ".csv":
+        return _read_csv(path)
+    raise ValueError(f"Unsupported trade file format: {ext!r}")
+
+def _read_csv(path):
+    try:
+        import pandas as pd
+    except ImportError:
+        pd = None
+    if pd is not None:
+        frame = pd.read_csv(path, dtype={name: str for name in TEXT_COLUMNS})
+        for name in TEXT_COLUMNS:
+            if name in frame:
+                frame[name] = frame[name].fillna("").str.strip()
+        return {name: frame[name].to_numpy() for name in frame.columns}
+
+    with open(path, "rb") as f:
+        data = f.read().replace(b"\r\n", b"\n")
+    newline = data.index(b"\n")
+    header = data[:newline].decode().strip().split(",")
+
+    # Blank fields become 'nan' so the typed C parser can read every column in one pass
+    body = b"\n" + data[newline + 1:]
+    for _ in range(2):
+        body = body.replace(b",,", b",nan,")
+    body = body.replace(b",\n", b",nan\n").replace(b"\n,", b"\nnan,")
+    if body.endswith(b","):
+        body += b"nan"
+
+    dtype = [(name, "U32" if name in TEXT_COLUMNS else "f8") for name in header]
+    table = np.loadtxt(io.BytesIO(body), delimiter=",", dtype=dtype, encoding="utf-8", ndmin=1)
+    columns = {}
+    for name in header:
+        col = table[name]
+        if name in TEXT_COLUMNS:
+            col = np.char.strip(col)
+            col[col == "nan"] = ""
+        columns[name] = col
+    return columns
+
+def write_results(path, results):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        np.save(path, results)
+    elif ext == ".parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        pq.write_table(pa.table({name: results[name] for name in results.dtype.names}), path)
+    elif ext == ".csv":
+        fmt = ["%d", "%s"] + ["%.10g"] * (len(RESULT_DTYPE) - 2)
+        np.savetxt(path, results, delimiter=",", fmt=fmt, header=",".join(results.dtype.names), comments="")
+    else:
+        raise ValueError(f"Unsupported results file format: {ext!r}")
+
+# =================== MODEL GROUPS ===================
+# Each pricer receives the group's columns (already subset to its trades) and
+# returns {result column: array}.
+
+def _column(trades, name, default):
+    col = trades.get(name)
+    if col is None:
+        return np.full(len(trades["model"]), default, dtype=type(default))
+    if isinstance(default, str):
+        return np.where(col == "", default, col)
+    return np.where(np.isnan(col), default, col)
+
+def _groups(*keys):
+    """Yields index arrays of the trades sharing the same values of every key column."""
+    _, inverse = np.unique(np.stack([np.unique(k, return_inverse=True)[1].ravel() for k in keys], axis=1),
+                           axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.flatnonzero(np.diff(inverse[order])) + 1
+    return np.split(order, bounds)
+
+def _price_black_scholes(t):
+    out = black_scholes_batch(t["S"], t["K"], t["T"], t["r"], t["sigma"], _column(t, "q", 0.0))
+    is_call = _column(t, "option_type", "call") == "call"
+    return {
+        "price": np.where(is_call, out["call"], out["put"]),
+        "delta": np.where(is_call, out["delta_call"], out["delta_put"]),
+        "gamma": out["gamma"],
+        "vega": out["vega"],
+    }
+
+def _price_american(t, chunk_size=20_000):
+    option_type = _column(t, "option_type", "call")
+    steps = _column(t, "steps", 100.0).astype(int)
+    price = np.empty(len(option_type))
+    for idx in _groups(option_type, steps):
+        # Chunks keep the (contracts x steps) tree layer bounded
+        for lo in range(0, len(idx), chunk_size):
+            part = idx[lo:lo + chunk_size]
+            price[part] = binomial_tree_american_batch(t["S"][part], t["K"][part], t["T"][part] * 360, t["r"][part],
+                                                       t["sigma"][part], steps[idx[0]], option_type[idx[0]])
+    return {"price": price}
+
+def _price_heston(t):
+    option_type = _column(t, "option_type", "call")
+    q = _column(t, "q", 0.0)
+    params = [t[name] for name in ("S", "T", "r", "v0", "kappa", "theta", "vol_of_vol", "rho")]
+    price = np.empty(len(option_type))
+    # One COS pass prices every strike of a parameter set
+    for idx in _groups(*params, q, option_type):
+        i = idx[0]
+        S, T, r, v0, kappa, theta, xi, rho = (p[i] for p in params)
+        price[idx] = heston_price_cos(S, t["K"][idx], T, r, v0, kappa, theta, xi, rho, q[i], option_type[i])
+    return {"price": price}
+
+def _price_swap(t):
+    payer = _column(t, "payer", 1.0) != 0
+    ppy = _column(t, "payments_per_year", 2.0)
+    price, par = np.empty(len(payer)), np.empty(len(payer))
+    for idx in _groups(t["rate"]):
+        out = price_swaps(YieldCurve.flat(t["rate"][idx[0]]), t["notional"][idx], t["fixed_rate"][idx],
+                          t["maturity"][idx], ppy[idx], payer=payer[idx])
+        price[idx], par[idx] = out["value"], out["par_rate"]
+    return {"price": price, "fair_rate": par}
+
+def _price_cap_floor(is_cap):
+    def pricer(t):
+        ppy = _column(t, "payments_per_year", 4.0)
+        price = np.empty(len(ppy))
+        for idx in _groups(t["rate"]):
+            price[idx] = price_caps_floors(YieldCurve.flat(t["rate"][idx[0]]), t["notional"][idx], t["strike"][idx],
+                                           t["maturity"][idx], t["sigma"][idx], ppy[idx], is_cap=is_cap)
+        return {"price": price}
+    return pricer
+
+def _price_cds(t):
+    recovery = _column(t, "recovery_rate", 0.4)
+    spread = _column(t, "spread", 0.0)
+    ppy = _column(t, "payments_per_year", 4.0)
+    price, fair = np.empty(len(ppy)), np.empty(len(ppy))
+    for idx in _groups(t["rate"], ppy):
+        # Flat hazard per name: a one-node curve for each trade
+        hazard = HazardCurve([t["maturity"][idx].max()], t["hazard_rate"][idx][:, None])
+        out = price_cds_batch(YieldCurve.flat(t["rate"][idx[0]]), hazard, t["maturity"][idx], spread[idx],
+                              t["notional"][idx], recovery[idx], ppy[idx[0]])
+        price[idx], fair[idx] = out["value"], out["fair_spread"]
+    return {"price": price, "fair_rate": fair}
+
+PRICERS = {
+    "black_scholes": _price_black_scholes,
+    "american": _price_american,
+    "heston": _price_heston,
+    "swap": _price_swap,
+    "cap": _price_cap_floor(True),
+    "floor": _price_cap_floor(False),
+    "cds": _price_cds,
+}
+
+def price_trades(trades, timings=None):
+    """
+    Prices a columnar trade set ({column: array}) model by model, each model
+    in vectorized groups, and returns a structured results array in trade
+    order. Unknown models raise ValueError. timings, if given, collects the
+    seconds spent per model.
+    """
+    model = np.asarray(trades["model"]).astype(str)
+    unknown = set(np.unique(model)) - set(PRICERS)
+    if unknown:
+        raise ValueError(f"Unknown models in trade file: {sorted(unknown)}")
+
+    results = np.zeros(len(model), dtype=RESULT_DTYPE)
+    results["trade"] = np.arange(len(model))
+    results["model"] = model
+    for name in ("price", "delta", "gamma", "vega", "fair_rate"):
+        results[name] = np.nan
+
+    for name, pricer in PRICERS.items():
+        idx = np.flatnonzero(model == name)
+        if not len(idx):
+            continue
+        start = time.perf_counter()
+        with quiet():
+            out = pricer({col: values[idx] for col, values in trades.items()})
+        for col, values in out.items():
+            results[col][idx] = values
+        if timings is not None:
+            timings[name] = time.perf_counter() - start
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Price a columnar trade file (CSV / NPY / Parquet) in bulk.")
+    parser.add_argument("trades", help="input trade file")
+    parser.add_argument("results", help="output results file (.csv, .npy or .parquet)")
+    parser.add_argument("--timings", action="store_true", help="print time spent per model")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    trades = read_trades(args.trades)
+    timings = {}
+    results = price_trades(trades, timings)
+    write_results(args.results, results)
+
+    print(f"✅ Priced {len(results):,} trades in {time.perf_counter() - start:.2f}s → {args.results}")
+    if args.timings:
+        for name, seconds in timings.items():
+            print(f"   {name:<14}{np.count_nonzero(results['model'] == name):>10,} trades {seconds:>8.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from black_sholes import black_scholes, black_scholes_batch
+
+# Benchmark: scalar black_scholes vs vectorized black_scholes_batch (contracts per second)
+def random_chain(n, seed=0):
+    rng = np.random.default_rng(seed)
+    S = rng.uniform(80, 120, n)
+    K = rng.uniform(70, 130, n)
+    days = rng.integers(7, 720, n)
+    r = rng.uniform(0.0, 0.06, n)
+    sigma = rng.uniform(0.1, 0.6, n)
+    return S, K, days, r, sigma
+
+def bench_scalar(n):
+    S, K, days, r, sigma = random_chain(n)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(n):
+            black_scholes(S[i], K[i], int(days[i]), r[i], sigma[i])
+    return n / (time.perf_counter() - start)
+
+def bench_batch(n, repeats=5):
+    S, K, days, r, sigma = random_chain(n)
+    T = days / 360
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        black_scholes_batch(S, K, T, r, sigma)
+        best = min(best, time.perf_counter() - start)
+    return n / best
+
+def check_consistency(n=200):
+    S, K, days, r, sigma = random_chain(n, seed=1)
+    out = black_scholes_batch(S, K, days / 360, r, sigma)
+    with contextlib.redirect_stdout(io.StringIO()):
+        ref = np.array([black_scholes(S[i], K[i], int(days[i]), r[i], sigma[i]) for i in range(n)])
+    return max(np.max(np.abs(out["call"] - ref[:, 0])), np.max(np.abs(out["put"] - ref[:, 1])))
+
+def main():
+    print("Black-Scholes throughput (contracts / second)\n")
+    print(f"Max abs difference batch vs scalar: {check_consistency():.2e}\n")
+
+    scalar_rate = bench_scalar(5_000)
+    print(f"{'scalar black_scholes':<28}{scalar_rate:>16,.0f}")
+    for n in (50_000, 500_000):
+        rate = bench_batch(n)
+        print(f"{f'black_scholes_batch n={n:,}':<28}{rate:>16,.0f}   ({rate / scalar_rate:,.0f}x)")
+
+if __name__ == "__main__":
+    main()
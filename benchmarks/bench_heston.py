@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stochastic_vol_model import heston_price_cos, heston_simulation, price_european_call_mc
+
+# Benchmark: Heston COS pricer vs Euler Monte Carlo on a strike grid
+S0, r, q = 100.0, 0.03, 0.0
+v0, kappa, theta, sigma, rho = 0.04, 2.0, 0.04, 0.5, -0.7
+T = 1.0
+STRIKES = np.linspace(60, 150, 200)
+
+def bench_cos(repeats=20):
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        prices = heston_price_cos(S0, STRIKES, T, r, v0, kappa, theta, sigma, rho, q)
+        best = min(best, time.perf_counter() - start)
+    return prices, best
+
+def bench_mc(n_paths, steps):
+    start = time.perf_counter()
+    S, _ = heston_simulation(S0, v0, r, kappa, theta, sigma, rho, T, steps, n_paths, rng=np.random.default_rng(0))
+    results = [price_european_call_mc(S, K, r, T, return_stderr=True) for K in STRIKES]
+    elapsed = time.perf_counter() - start
+    prices, stderrs = np.array(results).T
+    return prices, stderrs, elapsed
+
+def main():
+    print(f"Heston European calls, T={T}, {len(STRIKES)} strikes\n")
+    reference, cos_time = bench_cos()
+    print(f"{'method':<30}{'seconds':>10}{'max |err|':>12}{'mean stderr':>13}")
+    print(f"{'COS (N=512)':<30}{cos_time:>10.4f}{0.0:>12.2e}{'-':>13}")
+    for n_paths, steps in ((10_000, 50), (50_000, 100), (100_000, 252)):
+        prices, stderrs, elapsed = bench_mc(n_paths, steps)
+        label = f"MC Euler {n_paths:,} x {steps}"
+        print(f"{label:<30}{elapsed:>10.4f}{np.max(np.abs(prices - reference)):>12.2e}{np.mean(stderrs):>13.4f}"
+              f"   ({elapsed / cos_time:,.0f}x slower)")
+
+if __name__ == "__main__":
+    main()
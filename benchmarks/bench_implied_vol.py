@@ -0,0 +1,56 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from black_sholes import black_scholes_batch
+from vol_surface import implied_volatility_batch, implied_volatility_call
+
+# Benchmark: per-quote brentq (implied_volatility_call) vs implied_volatility_batch
+def random_quotes(n, seed=0):
+    rng = np.random.default_rng(seed)
+    S = 100.0
+    K = rng.uniform(60, 160, n)
+    T = rng.uniform(0.02, 2.0, n)
+    r = rng.uniform(0.0, 0.06, n)
+    sigma = rng.uniform(0.08, 0.9, n)
+    is_call = rng.random(n) < 0.5
+    out = black_scholes_batch(S, K, T, r, sigma)
+    prices = np.where(is_call, out["call"], out["put"])
+    # Quotes whose time value is lost to rounding cannot be inverted by any solver
+    forward_intrinsic = np.where(is_call, np.maximum(S - K * np.exp(-r * T), 0), np.maximum(K * np.exp(-r * T) - S, 0))
+    identifiable = prices - forward_intrinsic > 1e-8 * S
+    return prices, S, K, T, r, sigma, is_call, out["call"], identifiable
+
+def bench_brentq(n):
+    _, S, K, T, r, sigma, _, calls, _ = random_quotes(n)
+    identifiable = calls - np.maximum(S - K * np.exp(-r * T), 0) > 1e-8 * S
+    start = time.perf_counter()
+    iv = np.array([implied_volatility_call(calls[i], S, K[i], T[i], r[i]) for i in range(n)])
+    elapsed = time.perf_counter() - start
+    return n / elapsed, np.nanmax(np.abs(iv - sigma)[identifiable])
+
+def bench_batch(n, repeats=3):
+    prices, S, K, T, r, sigma, is_call, _, identifiable = random_quotes(n)
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        iv = implied_volatility_batch(prices, S, K, T, r, is_call)
+        best = min(best, time.perf_counter() - start)
+    return n / best, np.nanmax(np.abs(iv - sigma)[identifiable]), np.isnan(iv).sum()
+
+def main():
+    print("Implied volatility throughput (quotes / second)")
+    print("Errors are over quotes with time value above 1e-8 * S; NaN counts all quotes\n")
+    print(f"{'solver':<32}{'quotes/s':>14}{'max |error|':>14}{'NaN':>8}")
+    rate, err = bench_brentq(2_000)
+    print(f"{'brentq, calls only, n=2,000':<32}{rate:>14,.0f}{err:>14.2e}{'':>8}")
+    for n in (10_000, 1_000_000):
+        batch_rate, err, n_nan = bench_batch(n)
+        print(f"{f'batch, calls+puts, n={n:,}':<32}{batch_rate:>14,.0f}{err:>14.2e}{n_nan:>8}   ({batch_rate / rate:,.0f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = (
+    "black_sholes", "binomial_tree", "monte_carlo", "vol_surface", "ptf_hedging_simulation",
+    "hedging_policy_engine", "exotic_option_pricing", "stochastic_vol_model", "variance_reduction",
+    "multifractal_monte_carlo", "interest_rate_derivative_pricing", "credit_derivative_pricing",
+    "scenario_risk", "path_sources", "parallel_monte_carlo", "kernels", "batch_pricing",
+)
+
+# Heavy dependencies worth flagging when an import pulls them in
+HEAVY = ("scipy.stats", "scipy.optimize", "scipy.interpolate", "scipy.special", "scipy.sparse", "matplotlib.pyplot",
+         "numba")
+
+# Runs in a fresh interpreter so nothing is cached: numpy is imported first
+# and timed separately, so the module figure is what the repo itself adds
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import numpy
+numpy_s = time.perf_counter() - start
+start = time.perf_counter()
+__import__(sys.argv[1])
+module_s = time.perf_counter() - start
+print(json.dumps({"numpy": numpy_s, "module": module_s, "loaded": [m for m in json.loads(sys.argv[2]) if m in sys.modules]}))
+"""
+
+# Benchmark: cold-import latency of every module (median of fresh subprocesses)
+def cold_import(module, repeats=5):
+    runs = []
+    for _ in range(repeats):
+        out = subprocess.run([sys.executable, "-c", PROBE, module, json.dumps(HEAVY)], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        runs.append(json.loads(out.stdout))
+    return {
+        "numpy_ms": 1e3 * np.median([run["numpy"] for run in runs]),
+        "module_ms": 1e3 * np.median([run["module"] for run in runs]),
+        "loaded": runs[-1]["loaded"],
+    }
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"Cold import latency (median of {repeats} fresh interpreters, numpy excluded)\n")
+    print(f"{'module':<34}{'ms':>9}   heavy dependencies loaded")
+    for module in MODULES:
+        result = cold_import(module, repeats)
+        print(f"{module:<34}{result['module_ms']:>9.1f}   {', '.join(result['loaded']) or '-'}")
+
+if __name__ == "__main__":
+    main()
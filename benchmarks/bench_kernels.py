@@ -0,0 +1,70 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import kernels
+
+# Benchmark: NumPy vs Numba backend for every kernel, with the max abs difference between them
+def best_time(fn, repeats=3):
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+def kernel_cases(seed=0):
+    rng = np.random.default_rng(seed)
+    n, steps = 50_000, 252
+    Z = rng.standard_normal((n, steps))
+    W = rng.standard_normal((n, steps))
+    paths = kernels.gbm_paths(100.0, 0.0, 0.0126, Z)
+
+    contracts, tree_steps = 1_000, 300
+    dt = 0.5 / tree_steps
+    u = np.exp(rng.uniform(0.1, 0.5, contracts) * np.sqrt(dt))
+    q = (np.exp(0.03 * dt) - 1 / u) / (u - 1 / u)
+    dividends = np.zeros((contracts, tree_steps + 1))
+    dividends[:, tree_steps // 2] = 1.0
+    S = rng.uniform(80, 120, contracts)
+
+    holdings = rng.random((n, steps + 1))
+    return [
+        ("gbm_paths", f"{n:,} x {steps}", lambda: kernels.gbm_paths(100.0, 0.0001, 0.0126, Z)),
+        ("heston_euler_paths", f"{n:,} x {steps}",
+         lambda: kernels.heston_euler_paths(100.0, 0.04, 0.03, 2.0, 0.04, 0.5, -0.7, 1 / 252, Z, W)),
+        ("american_induction", f"{contracts:,} x {tree_steps}",
+         lambda: kernels.american_induction(S, np.full(contracts, 100.0), u, q, np.full(contracts, np.exp(-0.03 * dt)),
+                                            -1.0, dividends)),
+        ("path_statistics", f"{n:,} x {steps}", lambda: kernels.path_statistics(paths)),
+        ("hedge_cash", f"{n:,} x {steps}",
+         lambda: kernels.hedge_cash(np.zeros(n), holdings, paths, np.full(steps, np.exp(0.03 / 252)))),
+    ]
+
+def max_difference(a, b):
+    if isinstance(a, tuple):
+        return max(max_difference(x, y) for x, y in zip(a, b))
+    return float(np.max(np.abs(a - b)))
+
+def main():
+    print(f"Kernel backends (numba installed: {kernels.HAVE_NUMBA})\n")
+    print(f"{'kernel':<22}{'size':>18}{'numpy ms':>12}{'numba ms':>12}{'speedup':>10}{'max diff':>12}")
+    for name, size, fn in kernel_cases():
+        kernels.set_backend("numpy")
+        numpy_time, reference = best_time(fn)
+        row = f"{name:<22}{size:>18}{numpy_time * 1e3:>12.1f}"
+        if kernels.HAVE_NUMBA:
+            kernels.set_backend("numba")
+            fn()  # compile outside the timing
+            numba_time, out = best_time(fn)
+            row += f"{numba_time * 1e3:>12.1f}{numpy_time / numba_time:>9.1f}x{max_difference(reference, out):>12.2e}"
+        else:
+            row += f"{'n/a':>12}{'n/a':>10}{'n/a':>12}"
+        print(row)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parallel_monte_carlo import (exotic_gbm_shard, european_gbm_shard, heston_shard, run_parallel)
+
+# Benchmark: strong scaling of the process-pool executor over 1..N workers,
+# checking that every worker count reproduces the single-worker result exactly
+WORKLOADS = {
+    "european GBM, 20M paths": (european_gbm_shard, {"S": 100, "K": 100, "r": 0.05, "sigma": 0.2, "T": 1.0},
+                                20_000_000, 500_000),
+    "exotics GBM, 200k x 252": (exotic_gbm_shard, {"S0": 100, "K": 100, "B": 130, "r": 0.05, "sigma": 0.2,
+                                                  "T": 1.0, "steps": 252}, 200_000, 10_000),
+    "Heston, 200k x 252": (heston_shard, {"S0": 100, "K": 100, "r": 0.05, "v0": 0.04, "kappa": 2.0,
+                                          "theta": 0.04, "sigma": 0.3, "rho": -0.7, "T": 1.0, "steps": 252},
+                           200_000, 10_000),
+}
+
+def worker_counts():
+    n_cpu = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= n_cpu:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != n_cpu:
+        counts.append(n_cpu)
+    return counts
+
+def main():
+    print(f"Parallel Monte Carlo scaling ({os.cpu_count()} CPUs)\n")
+    for label, (shard_fn, params, n_paths, shard_size) in WORKLOADS.items():
+        print(label)
+        print(f"{'workers':>8}{'seconds':>10}{'speedup':>10}{'identical':>11}")
+        reference = base_time = None
+        for n_workers in worker_counts():
+            start = time.perf_counter()
+            totals = run_parallel(shard_fn, params, n_paths, seed=7, n_workers=n_workers, shard_size=shard_size)
+            elapsed = time.perf_counter() - start
+            reference = reference or totals
+            base_time = base_time or elapsed
+            print(f"{n_workers:>8}{elapsed:>10.2f}{base_time / elapsed:>9.2f}x{str(totals == reference):>11}")
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from black_sholes import black_scholes
+from interest_rate_derivative_pricing import price_cap_floor
+from pricing_cache import PricingCache
+from verbosity import quiet
+
+# Benchmark: a risk screen re-polling a book between ticks, with and without the pricing cache.
+# Each refresh reprices every contract; each tick moves the spot of a fraction of the names.
+def book(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "S": rng.uniform(80, 120, n).tolist(),
+        "K": rng.uniform(70, 130, n).tolist(),
+        "days": rng.integers(7, 720, n).tolist(),
+        "sigma": rng.uniform(0.1, 0.5, n).tolist(),
+        "strike": rng.uniform(0.02, 0.05, n).tolist(),
+    }
+
+def refresh(contracts, bs, cap):
+    for i in range(len(contracts["S"])):
+        bs(contracts["S"][i], contracts["K"][i], contracts["days"][i], 0.03, contracts["sigma"][i])
+        cap(1e6, contracts["strike"][i], 0.035, 5, 4, contracts["sigma"][i], 0.03)
+
+def run(bs, cap, n=2_000, refreshes=20, ticked=0.05, seed=1):
+    contracts = book(n)
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    for _ in range(refreshes):
+        names = rng.choice(n, int(ticked * n), replace=False)
+        for i in names:
+            contracts["S"][i] *= np.exp(0.001 * rng.standard_normal())
+        refresh(contracts, bs, cap)
+    return 2 * n * refreshes / (time.perf_counter() - start)
+
+def main():
+    print("Repeated pricing requests (calls / second), 5% of spots ticked per refresh\n")
+    with quiet():
+        plain_rate = run(black_scholes, price_cap_floor)
+        cache = PricingCache(maxsize=50_000)
+        cached_rate = run(cache.cached(black_scholes, sources=("equity", "rates", "vols")),
+                          cache.cached(price_cap_floor, sources=("rates", "vols")))
+    stats = cache.stats()
+    print(f"{'uncached':<12}{plain_rate:>14,.0f}")
+    print(f"{'cached':<12}{cached_rate:>14,.0f}   ({cached_rate / plain_rate:.1f}x, hit rate {stats['hit_rate']:.1%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from black_sholes import black_scholes_batch
+from exotic_option_pricing import generate_price_paths, price_asian_call
+from monte_carlo import monte_carlo_option_pricing_streaming
+import variance_reduction as vr
+
+# Benchmark: time-to-accuracy of each variance reduction technique.
+# RMSE is measured against a reference over independent repetitions and
+# extrapolated (error ~ 1/sqrt(cost)) to the time needed for a target error.
+S, K, r, sigma, T = 100.0, 100.0, 0.05, 0.2, 1.0
+TARGET_ERROR = 0.005
+REPEATS = 20
+
+def time_to_accuracy(run, reference):
+    errors, times = [], []
+    for seed in range(REPEATS):
+        start = time.perf_counter()
+        price = run(seed)
+        times.append(time.perf_counter() - start)
+        errors.append(price - reference)
+    rmse = np.sqrt(np.mean(np.square(errors)))
+    mean_time = np.mean(times)
+    return rmse, mean_time, mean_time * (rmse / TARGET_ERROR) ** 2
+
+def print_row(label, rmse, run_time, target_time, baseline):
+    print(f"{label:<38}{rmse:>10.5f}{run_time * 1e3:>12.1f}{target_time * 1e3:>14.1f}{baseline / target_time:>10.1f}x")
+
+def european_rows(n_paths=65_536, steps=32):
+    reference = float(black_scholes_batch(S, K, T, r, sigma)["call"])
+    baseline = None
+    for method in vr.METHODS:
+        for cv in (False, True):
+            run = lambda seed: monte_carlo_option_pricing_streaming(
+                S, K, T * 360, r, sigma, n_paths, steps=steps, chunk_size=n_paths // 4, seed=seed,
+                variance_reduction=method, control_variate=cv)["call_price"]
+            rmse, run_time, target_time = time_to_accuracy(run, reference)
+            baseline = baseline or target_time
+            print_row(f"{method}{' + BS control' if cv else ''}", rmse, run_time, target_time, baseline)
+
+def asian_rows(n_paths=32_768, steps=64):
+    # Reference from a large Sobol + control variate run
+    paths = generate_price_paths(S, r, sigma, T, steps, 2 ** 18, "sobol", np.random.default_rng(123))
+    reference = price_asian_call(paths, K, r, T, control_variate=True, sigma=sigma)
+    baseline = None
+    for method in vr.METHODS:
+        for cv in (False, True):
+            def run(seed):
+                paths = generate_price_paths(S, r, sigma, T, steps, n_paths, method, np.random.default_rng(seed))
+                return price_asian_call(paths, K, r, T, antithetic=method == "antithetic", control_variate=cv, sigma=sigma)
+            rmse, run_time, target_time = time_to_accuracy(run, reference)
+            baseline = baseline or target_time
+            print_row(f"{method}{' + geometric control' if cv else ''}", rmse, run_time, target_time, baseline)
+
+def main():
+    header = f"{'technique':<38}{'RMSE':>10}{'run ms':>12}{'target ms':>14}{'speedup':>11}"
+    print(f"Time to reach RMSE {TARGET_ERROR} ({REPEATS} repetitions per technique)\n")
+    print("European call, 32 steps, 65,536 paths")
+    print(header)
+    european_rows()
+    print("\nArithmetic Asian call, 64 steps, 32,768 paths")
+    print(header)
+    asian_rows()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import kernels
+from binomial_tree import binomial_tree_american_batch, binomial_tree_american_option
+from black_sholes import black_scholes, black_scholes_batch
+from credit_derivative_pricing import HazardCurve, cds_pricing, price_cds_batch
+from interest_rate_derivative_pricing import YieldCurve, price_caps_floors, price_swaps
+from monte_carlo import monte_carlo_option_pricing, monte_carlo_option_pricing_streaming
+from stochastic_vol_model import heston_log_simulation, heston_price_cos, heston_simulation
+from verbosity import quiet
+from vol_surface import build_vol_surface
+
+# Benchmark suite: throughput and peak memory of parametrized workloads for every
+# pricer, golden-price accuracy checks, JSON results and regression checks
+# against a stored baseline run.
+#
+#   python benchmarks/suite.py --output baseline.json
+#   python benchmarks/suite.py --compare baseline.json     (exit code 1 on regressions)
+
+# =================== WORKLOADS ===================
+# Each case builds its inputs outside the timed region and returns
+# (run, units): run() is what gets timed, units what throughput counts.
+
+def chain(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.uniform(80, 120, n), rng.uniform(70, 130, n), rng.integers(7, 720, n).astype(float),
+            rng.uniform(0.0, 0.06, n), rng.uniform(0.1, 0.6, n))
+
+def case_black_scholes_batch(contracts):
+    S, K, days, r, sigma = chain(contracts)
+    return lambda: black_scholes_batch(S, K, days / 360, r, sigma), contracts
+
+def case_binomial_tree(contracts, steps):
+    S, K, days, r, sigma = chain(contracts)
+    return lambda: binomial_tree_american_batch(S, K, days, r, sigma, steps, "put"), contracts * steps * steps // 2
+
+def case_monte_carlo(simulations, steps):
+    return (lambda: monte_carlo_option_pricing(100, 105, 180, 0.03, 0.2, simulations, steps,
+                                               rng=np.random.default_rng(0)), simulations * steps)
+
+def case_heston_simulation(n_paths, steps):
+    return (lambda: heston_simulation(100, 0.04, 0.03, 2.0, 0.04, 0.5, -0.7, 1.0, steps, n_paths,
+                                      rng=np.random.default_rng(0)), n_paths * steps)
+
+def case_heston_qe(n_paths, steps):
+    return (lambda: heston_log_simulation(100, 0.04, 0.03, 2.0, 0.04, 0.5, -0.7, 1.0, steps, n_paths,
+                                          rng=np.random.default_rng(0)), n_paths * steps)
+
+def case_heston_cos(strikes):
+    K = np.linspace(50, 200, strikes)
+    return lambda: heston_price_cos(100, K, 1.0, 0.03, 0.04, 2.0, 0.04, 0.5, -0.7), strikes
+
+def case_build_vol_surface(strikes, maturities):
+    K, T = (x.ravel() for x in np.meshgrid(np.linspace(60, 160, strikes), np.linspace(0.1, 3.0, maturities)))
+    vol = 0.2 + 0.1 * (np.log(K / 100)) ** 2 + 0.02 * T
+    prices = black_scholes_batch(100, K, T, 0.03, vol)["call"]
+    option_data = [{"K": k, "T": t, "C": c} for k, t, c in zip(K, T, prices)]
+    return lambda: build_vol_surface(option_data, 100, 0.03), strikes * maturities
+
+def case_cds_pricing(maturity, payments_per_year):
+    return lambda: cds_pricing(1e6, maturity, 0.03, 0.4, 0.02, payments_per_year), maturity * payments_per_year
+
+def case_cds_batch(trades, tenors):
+    curve = YieldCurve.flat(0.03)
+    pillars = np.linspace(1, 10, tenors)
+    hazard = HazardCurve.bootstrap(pillars, 0.01 + 0.002 * np.sqrt(pillars), curve)
+    maturity = np.random.default_rng(0).uniform(0.5, 10, trades)
+    return lambda: price_cds_batch(curve, hazard, maturity, 0.01, cs01=True), trades
+
+def case_curve_bootstrap(pillars):
+    swaps = [(t, 0.03 + 0.01 * math.log1p(t) / 4) for t in np.linspace(1, 50, pillars).round()]
+    return lambda: YieldCurve.bootstrap(deposits=[(0.25, 0.03), (0.5, 0.031)], swaps=dict(swaps).items()), pillars
+
+def case_swaps_caps(trades):
+    curve = YieldCurve.bootstrap(deposits=[(0.25, 0.03)], swaps=[(1, 0.032), (5, 0.035), (10, 0.037), (30, 0.04)])
+    rng = np.random.default_rng(0)
+    maturity = rng.integers(1, 31, trades).astype(float)
+    strike = rng.uniform(0.02, 0.05, trades)
+
+    def run():
+        price_swaps(curve, 1e6, strike, maturity)
+        price_caps_floors(curve, 1e6, strike, maturity, 0.2)
+    return run, trades
+
+# name: (module, unit, case, full parameter grid, quick parameter grid)
+WORKLOADS = {
+    "black_scholes_batch": ("black_sholes", "contracts", case_black_scholes_batch,
+                            [{"contracts": n} for n in (10_000, 100_000, 1_000_000)],
+                            [{"contracts": n} for n in (10_000, 100_000)]),
+    "binomial_tree_american": ("binomial_tree", "nodes", case_binomial_tree,
+                               [{"contracts": 100, "steps": 100}, {"contracts": 100, "steps": 500},
+                                {"contracts": 2_000, "steps": 200}],
+                               [{"contracts": 100, "steps": 100}, {"contracts": 500, "steps": 200}]),
+    "monte_carlo": ("monte_carlo", "path steps", case_monte_carlo,
+                    [{"simulations": 10_000, "steps": 100}, {"simulations": 100_000, "steps": 100}],
+                    [{"simulations": 10_000, "steps": 100}]),
+    "heston_simulation": ("stochastic_vol_model", "path steps", case_heston_simulation,
+                          [{"n_paths": 10_000, "steps": 100}, {"n_paths": 50_000, "steps": 252}],
+                          [{"n_paths": 10_000, "steps": 100}]),
+    "heston_qe": ("stochastic_vol_model", "path steps", case_heston_qe,
+                  [{"n_paths": 10_000, "steps": 100}, {"n_paths": 100_000, "steps": 252}],
+                  [{"n_paths": 10_000, "steps": 100}]),
+    "heston_cos": ("stochastic_vol_model", "strikes", case_heston_cos,
+                   [{"strikes": n} for n in (10, 200, 2_000)],
+                   [{"strikes": n} for n in (10, 200)]),
+    "build_vol_surface": ("vol_surface", "quotes", case_build_vol_surface,
+                          [{"strikes": 20, "maturities": 10}, {"strikes": 200, "maturities": 50}],
+                          [{"strikes": 20, "maturities": 10}]),
+    "cds_pricing": ("credit_derivative_pricing", "periods", case_cds_pricing,
+                    [{"maturity": 5, "payments_per_year": 4}, {"maturity": 30, "payments_per_year": 12}],
+                    [{"maturity": 5, "payments_per_year": 4}]),
+    "cds_batch": ("credit_derivative_pricing", "trades", case_cds_batch,
+                  [{"trades": 1_000, "tenors": 5}, {"trades": 20_000, "tenors": 10}],
+                  [{"trades": 1_000, "tenors": 5}]),
+    "curve_bootstrap": ("interest_rate_derivative_pricing", "pillars", case_curve_bootstrap,
+                        [{"pillars": n} for n in (5, 20, 50)],
+                        [{"pillars": n} for n in (5, 20)]),
+    "swaps_caps": ("interest_rate_derivative_pricing", "trades", case_swaps_caps,
+                   [{"trades": n} for n in (1_000, 20_000)],
+                   [{"trades": 1_000}]),
+}
+
+# =================== MEASUREMENT ===================
+
+def measure(case, params, repeats=5, min_time=0.2):
+    """
+    Best wall time of run() over repeats (more for fast workloads, until
+    min_time is spent) and peak traced allocation of one extra run. NumPy
+    reports its buffers to tracemalloc, so peak_mb covers array temporaries.
+    """
+    run, units = case(**params)
+    run()  # warm-up: lazy imports, JIT compilation, caches
+
+    times = []
+    while len(times) < repeats or (sum(times) < min_time and len(times) < 100):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    best = min(times)
+    return {"seconds": best, "median_seconds": float(np.median(times)), "throughput": units / best,
+            "units": units, "peak_mb": peak / 2 ** 20, "runs": len(times)}
+
+def run_workloads(names=None, quick=False, repeats=5):
+    results = []
+    for name, (module, unit, case, full, small) in WORKLOADS.items():
+        if names and not any(pattern in name for pattern in names):
+            continue
+        for params in small if quick else full:
+            result = {"workload": name, "module": module, "unit": unit, "params": params}
+            with quiet():
+                result.update(measure(case, params, repeats))
+            results.append(result)
+            print(f"{name:<24}{format_params(params):<32}{result['seconds'] * 1e3:>11.2f} ms"
+                  f"{result['throughput']:>16,.0f} {unit}/s{result['peak_mb']:>10.1f} MB")
+    return results
+
+def format_params(params):
+    return ", ".join(f"{key}={value:,}" if isinstance(value, int) else f"{key}={value}" for key, value in params.items())
+
+# =================== GOLDEN PRICES ===================
+# Closed forms and published reference values; speedups must keep these.
+
+# Fang & Oosterlee (2008), Heston test case: 5.785155450 for the ATM call
+HESTON_REFERENCE = {"S0": 100, "K": 100, "T": 1.0, "r": 0.0, "v0": 0.0175, "kappa": 1.5768, "theta": 0.0398,
+                    "sigma": 0.5751, "rho": -0.5711, "call": 5.785155450}
+
+def golden_checks():
+    # (name, value, reference, tolerance)
+    checks = []
+    with quiet():
+        # Hull's textbook example: S=42, K=40, r=10%, sigma=20%, T=0.5 -> 4.7594 / 0.8086
+        call, put = black_scholes(42, 40, 180, 0.1, 0.2)
+        d1 = (math.log(42 / 40) + (0.1 + 0.02) * 0.5) / (0.2 * math.sqrt(0.5))
+        d2 = d1 - 0.2 * math.sqrt(0.5)
+        N = lambda x: 0.5 * math.erfc(-x / math.sqrt(2))
+        exact_call = 42 * N(d1) - 40 * math.exp(-0.05) * N(d2)
+        exact_put = 40 * math.exp(-0.05) * N(-d2) - 42 * N(-d1)
+        checks.append(("black_scholes call (Hull 42/40)", call, 4.7594, 5e-5))
+        checks.append(("black_scholes put (Hull 42/40)", put, 0.8086, 5e-5))
+        batch = black_scholes_batch([42, 42], [40, 40], [0.5, 0.5], 0.1, 0.2)
+        checks.append(("black_scholes_batch call", batch["call"][0], exact_call, 1e-12))
+        checks.append(("black_scholes_batch put", batch["put"][0], exact_put, 1e-12))
+        checks.append(("black_scholes_batch put-call parity",
+                       batch["call"][1] - batch["put"][1], 42 - 40 * math.exp(-0.05), 1e-12))
+
+        # No dividends: the American call equals the European one
+        checks.append(("binomial_tree american call, 2000 steps",
+                       binomial_tree_american_option(42, 40, 180, 0.1, 0.2, 2_000, "call"), exact_call, 2e-3))
+
+        mc = monte_carlo_option_pricing_streaming(42, 40, 180, 0.1, 0.2, 400_000, seed=1)
+        checks.append(("monte_carlo streaming call (4 stderr)", mc["call_price"], exact_call, 4 * mc["call_stderr"]))
+
+        h = HESTON_REFERENCE
+        args = (h["r"], h["v0"], h["kappa"], h["theta"], h["sigma"], h["rho"])
+        cos = heston_price_cos(h["S0"], h["K"], h["T"], *args)
+        checks.append(("heston_price_cos (Fang-Oosterlee)", float(np.ravel(cos)[0]), h["call"], 1e-6))
+        x_T, _ = heston_log_simulation(h["S0"], h["v0"], h["r"], h["kappa"], h["theta"], h["sigma"], h["rho"],
+                                       h["T"], 100, 200_000, rng=np.random.default_rng(3))
+        payoff = np.maximum(np.exp(x_T) - h["K"], 0)
+        stderr = payoff.std(ddof=1) / math.sqrt(len(payoff))
+        checks.append(("heston QE Monte Carlo (4 stderr + 0.01 bias)", payoff.mean(), h["call"], 4 * stderr + 0.01))
+
+        # Quarterly premiums on a flat hazard rate: spread = (1 - R)(e^{lambda dt} - 1) / dt exactly
+        checks.append(("cds_pricing flat hazard", cds_pricing(1, 5, 0.03, 0.4, 0.02, 4),
+                       0.6 * math.expm1(0.02 * 0.25) / 0.25, 1e-12))
+
+        # Surface built from Black-Scholes prices recovers the input vols
+        K, T = (x.ravel() for x in np.meshgrid(np.linspace(70, 140, 8), np.linspace(0.25, 2, 4)))
+        vol = 0.2 + 0.1 * (np.log(K / 100)) ** 2
+        prices = black_scholes_batch(100, K, T, 0.03, vol)["call"]
+        _, _, surface = build_vol_surface([{"K": k, "T": t, "C": c} for k, t, c in zip(K, T, prices)], 100, 0.03)
+        checks.append(("build_vol_surface round trip (max error)", np.nanmax(np.abs(surface.ravel() - vol)), 0.0, 1e-8))
+
+        # A bootstrapped curve reprices its own par swaps at zero
+        quotes = [(1, 0.032), (2, 0.033), (5, 0.035), (10, 0.037)]
+        curve = YieldCurve.bootstrap(deposits=[(0.25, 0.03)], swaps=quotes)
+        values = price_swaps(curve, 1.0, [q for _, q in quotes], [t for t, _ in quotes])["value"]
+        checks.append(("par swaps on bootstrapped curve (max |value|)", np.max(np.abs(values)), 0.0, 1e-10))
+
+    return [{"name": name, "value": float(value), "reference": float(reference), "error": abs(value - reference),
+             "tolerance": float(tolerance), "ok": bool(abs(value - reference) <= tolerance)}
+            for name, value, reference, tolerance in checks]
+
+# =================== BASELINE COMPARISON ===================
+
+def result_key(result):
+    return result["workload"], json.dumps(result["params"], sort_keys=True)
+
+def compare(results, baseline, time_threshold=0.25, memory_threshold=0.25):
+    """
+    Flags workloads slower (best time) or heavier (peak memory) than the
+    baseline by more than the given fractions. Workloads missing from the
+    baseline are reported as new, not as regressions.
+    """
+    previous = {result_key(result): result for result in baseline["results"]}
+    regressions = []
+    print(f"\n{'workload':<24}{'params':<32}{'time ratio':>12}{'memory ratio':>14}")
+    for result in results:
+        base = previous.get(result_key(result))
+        label = f"{result['workload']:<24}{format_params(result['params']):<32}"
+        if base is None:
+            print(f"{label}{'new':>12}")
+            continue
+        time_ratio = result["seconds"] / base["seconds"]
+        memory_ratio = result["peak_mb"] / base["peak_mb"] if base["peak_mb"] > 0 else 1.0
+        flags = []
+        if time_ratio > 1 + time_threshold:
+            flags.append("SLOWER")
+        if memory_ratio > 1 + memory_threshold:
+            flags.append("MORE MEMORY")
+        if flags:
+            regressions.append({"workload": result["workload"], "params": result["params"], "time_ratio": time_ratio,
+                                "memory_ratio": memory_ratio, "flags": flags})
+        print(f"{label}{time_ratio:>11.2f}x{memory_ratio:>13.2f}x   {' '.join(flags)}")
+    return regressions
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "backend": kernels.get_backend(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark and regression suite for the pricers.")
+    parser.add_argument("--quick", action="store_true", help="small parameter grid only")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="run workloads whose name contains NAME")
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs per workload (default 5)")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against a previous JSON result")
+    parser.add_argument("--time-threshold", type=float, default=0.25, help="allowed slowdown fraction (default 0.25)")
+    parser.add_argument("--memory-threshold", type=float, default=0.25,
+                        help="allowed peak memory growth fraction (default 0.25)")
+    parser.add_argument("--skip-golden", action="store_true", help="skip the golden price checks")
+    args = parser.parse_args()
+
+    print(f"{'workload':<24}{'params':<32}{'best':>14}{'throughput':>22}{'peak':>13}")
+    results = run_workloads(args.only, args.quick, args.repeats)
+
+    golden = []
+    if not args.skip_golden:
+        golden = golden_checks()
+        print(f"\n{'golden check':<48}{'value':>16}{'reference':>16}{'error':>11}")
+        for check in golden:
+            status = "ok" if check["ok"] else f"FAIL (tol {check['tolerance']:.1e})"
+            print(f"{check['name']:<48}{check['value']:>16.10f}{check['reference']:>16.10f}{check['error']:>11.2e}   {status}")
+
+    report = {"environment": environment(), "results": results, "golden": golden}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        report["regressions"] = compare(results, baseline, args.time_threshold, args.memory_threshold)
+        report["baseline_environment"] = baseline.get("environment")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    failed = [check["name"] for check in golden if not check["ok"]]
+    regressions = report.get("regressions", [])
+    if failed or regressions:
+        print(f"\n❌ {len(regressions)} performance regression(s), {len(failed)} golden price failure(s)")
+        sys.exit(1)
+    print("\n✅ No regressions")
+
+if __name__ == "__main__":
+    main()
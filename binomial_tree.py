@@ -1,52 +1,64 @@
 import numpy as np
 
-def binomial_tree_american_option(S, K, days, r, sigma, steps=100, option_type='call', dividend_schedule=[]):
-    print("\n--- Binomial Tree American Option Pricing ---")
+import kernels
+from instrumentation import phase
+from verbosity import report
+
+def binomial_tree_american_option(S, K, days, r, sigma, steps=100, option_type='call', dividend_schedule=()):
+    report("\n--- Binomial Tree American Option Pricing ---")
     T = days / 360
     dt = T / steps
     u = np.exp(sigma * np.sqrt(dt))
     d = 1 / u
     q = (np.exp(r * dt) - d) / (u - d)
 
-    print(f"Time to maturity (T): {T:.6f} years")
-    print(f"Step size (dt): {dt:.6f}")
-    print(f"Up factor (u): {u:.4f}")
-    print(f"Down factor (d): {d:.4f}")
-    print(f"Risk-neutral prob. (q): {q:.4f}\n")
+    report(f"Time to maturity (T): {T:.6f} years")
+    report(f"Step size (dt): {dt:.6f}")
+    report(f"Up factor (u): {u:.4f}")
+    report(f"Down factor (d): {d:.4f}")
+    report(f"Risk-neutral prob. (q): {q:.4f}\n")
 
-    # Adjust dividend steps to tree step indexes
-    dividend_steps = [int(t / T * steps) for t in dividend_schedule]
+    with phase("binomial_tree_american_option", steps=steps):
+        price = binomial_tree_american_batch(S, K, days, r, sigma, steps, option_type, dividend_schedule)[0]
 
-    # Build stock price tree
-    stock_tree = np.zeros((steps + 1, steps + 1))
-    for i in range(steps + 1):
-        for j in range(i + 1):
-            stock_tree[j, i] = S * (u ** (i - j)) * (d ** j)
-    
-    # Subtract dividends at the right steps
-    for div_step in dividend_steps:
-        for j in range(div_step + 1):
-            stock_tree[j, div_step] = max(stock_tree[j, div_step] - dividend_schedule[dividend_steps.index(div_step + 1)], 0)
+    report(f"📈 American {option_type.capitalize()} Option Price: {price:.4f}")
+    return price
 
-    # Build option value tree
-    option_tree = np.zeros_like(stock_tree)
+# Dividend amounts (per contract) keyed by the tree step they fall on
+def dividend_amounts_by_step(dividend_schedule, T, steps):
+    amounts = {}
+    for t, amount in dividend_schedule:
+        div_steps = (t / T * steps).astype(int)
+        for step in np.unique(div_steps):
+            if 0 <= step <= steps:
+                amounts.setdefault(step, np.zeros_like(T))
+                amounts[step] += np.where(div_steps == step, amount, 0.0)
+    return amounts
 
-    # Terminal payoffs
-    for j in range(steps + 1):
-        if option_type == 'call':
-            option_tree[j, steps] = max(stock_tree[j, steps] - K, 0)
-        else:
-            option_tree[j, steps] = max(K - stock_tree[j, steps], 0)
+# Prices many American contracts at once with a rolling (contracts x nodes) array
+def binomial_tree_american_batch(S, K, days, r, sigma, steps=100, option_type='call', dividend_schedule=()):
+    """
+    Vectorized CRR backward induction. S, K, days, r and sigma broadcast to one
+    contract per element; dividend_schedule is a list of (time in years, amount)
+    pairs shared by all contracts. Memory is O(contracts x steps).
+    """
+    S, K, days, r, sigma = np.broadcast_arrays(*(np.atleast_1d(np.asarray(x, dtype=float)) for x in (S, K, days, r, sigma)))
+    T = days / 360
+    dt = T / steps
+    u = np.exp(sigma * np.sqrt(dt))
+    d = 1 / u
+    q = (np.exp(r * dt) - d) / (u - d)
+    disc = np.exp(-r * dt)
+    sign = 1.0 if option_type == 'call' else -1.0
 
-    # Backward induction
-    for i in range(steps - 1, -1, -1):
-        for j in range(i + 1):
-            hold = np.exp(-r * dt) * (q * option_tree[j, i + 1] + (1 - q) * option_tree[j + 1, i + 1])
-            exercise = (stock_tree[j, i] - K if option_type == 'call' else K - stock_tree[j, i])
-            option_tree[j, i] = max(hold, exercise)
+    with phase("binomial_tree.setup") as p:
+        dividends = np.zeros((len(S), steps + 1))
+        for step, amounts in dividend_amounts_by_step(dividend_schedule, T, steps).items():
+            dividends[:, step] = amounts
+        p.add(bytes=dividends.nbytes)
 
-    print(f"📈 American {option_type.capitalize()} Option Price: {option_tree[0,0]:.4f}")
-    return option_tree[0,0]
+    with phase("binomial_tree.induction", nodes=len(S) * (steps + 1) * (steps + 2) // 2):
+        return kernels.american_induction(S, K, u, q, disc, sign, dividends)
 
 def main():
     print("American Option Pricing using Binomial Tree (with Dividends)\n")
@@ -66,11 +78,7 @@ def main():
         amount = float(input(f"  Enter dividend amount {i+1}: "))
         dividend_schedule.append((t, amount))
 
-    # Flatten dividend times
-    div_times = [t for t, _ in dividend_schedule]
-    div_values = [v for _, v in dividend_schedule]
-
-    binomial_tree_american_option(S, K, days, r, sigma, steps, option_type, div_values)
+    binomial_tree_american_option(S, K, days, r, sigma, steps, option_type, dividend_schedule)
 
 if __name__ == "__main__":
     main()
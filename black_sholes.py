@@ -1,35 +1,85 @@
 import math
-from scipy.stats import norm
+import numpy as np
+
+from normal_distribution import norm_cdf
+from verbosity import report, is_verbose
 
 # Black-Scholes formula for European Call and Put
 def black_scholes(S, K, days, r, sigma):
-    print("\n--- Black-Scholes Calculation Steps ---")
-    print(f"Spot Price (S): {S}")
-    print(f"Strike Price (K): {K}")
-    print(f"Days to Expiration: {days}")
+    report("\n--- Black-Scholes Calculation Steps ---")
+    report(f"Spot Price (S): {S}")
+    report(f"Strike Price (K): {K}")
+    report(f"Days to Expiration: {days}")
     T = days / 360
-    print(f"Converted Time to Maturity (T in years): {T:.6f}")
-    print(f"Risk-free Rate (r): {r}")
-    print(f"Volatility (sigma): {sigma}\n")
+    report(f"Converted Time to Maturity (T in years): {T:.6f}")
+    report(f"Risk-free Rate (r): {r}")
+    report(f"Volatility (sigma): {sigma}\n")
 
     d1 = (math.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * math.sqrt(T))
     d2 = d1 - sigma * math.sqrt(T)
 
-    print(f"Calculated d1: {d1:.4f}")
-    print(f"Calculated d2: {d2:.4f}")
-    print(f"N(d1): {norm.cdf(d1):.4f}")
-    print(f"N(d2): {norm.cdf(d2):.4f}")
-    print(f"N(-d1): {norm.cdf(-d1):.4f}")
-    print(f"N(-d2): {norm.cdf(-d2):.4f}\n")
+    if is_verbose():
+        report(f"Calculated d1: {d1:.4f}")
+        report(f"Calculated d2: {d2:.4f}")
+        report(f"N(d1): {norm_cdf(d1):.4f}")
+        report(f"N(d2): {norm_cdf(d2):.4f}")
+        report(f"N(-d1): {norm_cdf(-d1):.4f}")
+        report(f"N(-d2): {norm_cdf(-d2):.4f}\n")
 
-    call_price = S * norm.cdf(d1) - K * math.exp(-r * T) * norm.cdf(d2)
-    put_price = K * math.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
+    call_price = S * norm_cdf(d1) - K * math.exp(-r * T) * norm_cdf(d2)
+    put_price = K * math.exp(-r * T) * norm_cdf(-d2) - S * norm_cdf(-d1)
 
-    print(f"📈 Call Option Price: {call_price:.4f}")
-    print(f"📉 Put Option Price:  {put_price:.4f}")
+    report(f"📈 Call Option Price: {call_price:.4f}")
+    report(f"📉 Put Option Price:  {put_price:.4f}")
 
     return call_price, put_price
 
+# Vectorized Black-Scholes prices and Greeks for whole option chains
+def black_scholes_batch(S, K, T, r, sigma, q=0.0):
+    """
+    Prices calls and puts with Greeks for arrays of contracts in one pass.
+    All inputs broadcast against each other; T is in years and q is the
+    continuous dividend yield. Theta is per year, vega and rho per unit change.
+    """
+    S, K, T, r, sigma, q = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (S, K, T, r, sigma, q)))
+
+    sqrt_T = np.sqrt(T)
+    sig_sqrt_T = sigma * sqrt_T
+    d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / sig_sqrt_T
+    d2 = d1 - sig_sqrt_T
+
+    # N(-x) is evaluated directly: 1 - N(x) cancels to 0 in the far tail
+    Nd1 = norm_cdf(d1)
+    Nd2 = norm_cdf(d2)
+    Nmd1 = norm_cdf(-d1)
+    Nmd2 = norm_cdf(-d2)
+    pdf_d1 = np.exp(-0.5 * d1 ** 2) / math.sqrt(2 * math.pi)
+
+    disc_r = np.exp(-r * T)
+    disc_q = np.exp(-q * T)
+    S_fwd = S * disc_q
+    K_disc = K * disc_r
+
+    call = S_fwd * Nd1 - K_disc * Nd2
+    put = K_disc * Nmd2 - S_fwd * Nmd1
+
+    gamma = disc_q * pdf_d1 / (S * sig_sqrt_T)
+    vega = S_fwd * pdf_d1 * sqrt_T
+    theta_common = -S_fwd * pdf_d1 * sigma / (2 * sqrt_T)
+
+    return {
+        "call": call,
+        "put": put,
+        "delta_call": disc_q * Nd1,
+        "delta_put": -disc_q * Nmd1,
+        "gamma": gamma,
+        "vega": vega,
+        "theta_call": theta_common - r * K_disc * Nd2 + q * S_fwd * Nd1,
+        "theta_put": theta_common + r * K_disc * Nmd2 - q * S_fwd * Nmd1,
+        "rho_call": K_disc * T * Nd2,
+        "rho_put": -K_disc * T * Nmd2,
+    }
+
 # Gather inputs from the user
 def main():
     print("Black-Scholes Option Pricing Model\n")
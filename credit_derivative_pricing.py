@@ -1,5 +1,8 @@
 import numpy as np
 
+from interest_rate_derivative_pricing import unique_terms
+from verbosity import report
+
 def discount_factor(rate, t):
     return np.exp(-rate * t)
 
@@ -9,13 +12,10 @@ def cds_pricing(notional, maturity, r, recovery_rate, hazard_rate, payments_per_
     
     # --- Survival and default probabilities
     survival_probs = np.exp(-hazard_rate * times)
-    default_probs = np.zeros_like(times)
-    default_probs[0] = 1 - survival_probs[0]
-    for i in range(1, len(times)):
-        default_probs[i] = survival_probs[i-1] - survival_probs[i]
+    default_probs = -np.diff(survival_probs, prepend=1.0)
 
     # --- Discount factors
-    dfs = np.array([discount_factor(r, t) for t in times])
+    dfs = discount_factor(r, times)
 
     # --- Premium leg: payments made if no default
     premium_leg = np.sum(dfs * survival_probs * dt) * notional
@@ -26,17 +26,159 @@ def cds_pricing(notional, maturity, r, recovery_rate, hazard_rate, payments_per_
     # --- Fair spread
     fair_spread = protection_leg / premium_leg
 
-    print("\n--- CDS Pricing Summary ---")
-    print(f"Notional: {notional}")
-    print(f"Maturity: {maturity} years")
-    print(f"Risk-Free Rate: {r}")
-    print(f"Recovery Rate: {recovery_rate}")
-    print(f"Hazard Rate (λ): {hazard_rate}")
-    print(f"Payments per Year: {payments_per_year}")
-    print(f"\n📈 Fair CDS Spread: {fair_spread * 10000:.2f} bps")
+    report("\n--- CDS Pricing Summary ---")
+    report(f"Notional: {notional}")
+    report(f"Maturity: {maturity} years")
+    report(f"Risk-Free Rate: {r}")
+    report(f"Recovery Rate: {recovery_rate}")
+    report(f"Hazard Rate (λ): {hazard_rate}")
+    report(f"Payments per Year: {payments_per_year}")
+    report(f"\n📈 Fair CDS Spread: {fair_spread * 10000:.2f} bps")
 
     return fair_spread
 
+# =================== HAZARD CURVES ===================
+
+class HazardCurve:
+    """
+    Piecewise-constant hazard rates for one or many names on common tenor
+    nodes: rates has shape (n_names, n_tenors) and rate k applies on
+    (tenors[k-1], tenors[k]], the last one extending beyond the last tenor.
+    """
+
+    def __init__(self, tenors, rates):
+        self.tenors = np.asarray(tenors, dtype=float)
+        self.rates = np.atleast_2d(np.asarray(rates, dtype=float))
+        self.quotes = None
+
+    @classmethod
+    def bootstrap(cls, tenors, spreads, discount_curve, recovery_rate=0.4, payments_per_year=4):
+        """
+        Bootstraps every name at once from par spreads of shape
+        (n_names, n_tenors): tenor by tenor, the new hazard rate of all names
+        is solved with one vectorized Newton iteration on the CDS value.
+        """
+        tenors = np.asarray(tenors, dtype=float)
+        spreads = np.atleast_2d(np.asarray(spreads, dtype=float))
+        recovery = np.broadcast_to(np.asarray(recovery_rate, dtype=float), spreads.shape[:1])
+        curve = cls(tenors, np.zeros_like(spreads))
+        names = np.arange(len(spreads))
+
+        for k, tenor in enumerate(tenors):
+            schedule = cds_schedule(np.full(len(spreads), tenor), payments_per_year)
+
+            def value(h):
+                curve.rates[:, k:] = h[:, None]
+                return _cds_legs(discount_curve, curve, schedule, names, recovery, spreads[:, k])[0]
+
+            # Credit triangle as the starting point, then Newton with a forward-difference slope
+            h = spreads[:, k] / (1 - recovery)
+            for _ in range(20):
+                v = value(h)
+                slope = (value(h + 1e-7) - v) / 1e-7
+                step = v / slope
+                h = np.maximum(h - step, 0.0)
+                if np.max(np.abs(step)) < 1e-12:
+                    break
+            curve.rates[:, k:] = h[:, None]
+
+        curve.quotes = (spreads, discount_curve, recovery, payments_per_year)
+        return curve
+
+    def cumulative_hazard(self, t):
+        """Integrated hazard, shape (n_names, len(t))."""
+        t = np.atleast_1d(np.asarray(t, dtype=float))
+        left = np.concatenate([[0.0], self.tenors[:-1]])
+        right = np.concatenate([self.tenors[:-1], [np.inf]])
+        overlap = np.clip(np.minimum(t[:, None], right) - left, 0, None)
+        return self.rates @ overlap.T
+
+    def survival(self, t):
+        return np.exp(-self.cumulative_hazard(t))
+
+    def bumped(self, bump=1e-4):
+        """Re-bootstraps the curve with every quoted spread moved by bump."""
+        if self.quotes is None:
+            raise ValueError("Spread bumps need a curve built with HazardCurve.bootstrap")
+        spreads, discount_curve, recovery, payments_per_year = self.quotes
+        return HazardCurve.bootstrap(self.tenors, spreads + bump, discount_curve, recovery, payments_per_year)
+
+# =================== BATCH CDS ===================
+
+def cds_schedule(maturity, payments_per_year=4):
+    """
+    Premium periods rolled backwards from each maturity, so any stub is the
+    (short) first period. Returns padded (n_trades, max_periods) begin/end
+    times, the grid of unique times (including period midpoints) and indices
+    into it.
+    """
+    (maturity, payments_per_year), trade_terms = unique_terms(maturity, payments_per_year)
+    dt = 1 / payments_per_year
+    n_periods = np.ceil(maturity / dt - 1e-9).astype(int)
+    k = np.arange(n_periods.max())
+    mask = k < n_periods[:, None]
+    end = np.where(mask, maturity[:, None] - (n_periods[:, None] - 1 - k) * dt[:, None], 0.0)
+    begin = np.where(mask, np.maximum(end - dt[:, None], 0.0), 0.0)
+
+    grid, index = np.unique(np.round(np.stack([begin, end, 0.5 * (begin + end)]), 10), return_inverse=True)
+    index = index.reshape(3, *mask.shape)[:, trade_terms]
+    return {
+        "grid": grid,
+        "begin_index": index[0],
+        "end_index": index[1],
+        "mid_index": index[2],
+        "accrual": (end - begin)[trade_terms],
+        "mask": mask[trade_terms],
+    }
+
+def _cds_legs(discount_curve, hazard_curve, schedule, names, recovery, spread):
+    """Protection-buyer value per unit notional, protection leg and risky annuity (RPV01)."""
+    df = discount_curve.discount(schedule["grid"])
+    survival = hazard_curve.survival(schedule["grid"])
+    rows = names[:, None]
+    s_begin = survival[rows, schedule["begin_index"]]
+    s_end = survival[rows, schedule["end_index"]]
+    default = (s_begin - s_end) * schedule["mask"]
+    df_mid = df[schedule["mid_index"]]
+    tau = schedule["accrual"]
+
+    # Premium paid on survival, plus half a period of accrual on average on default
+    annuity = np.sum(tau * df[schedule["end_index"]] * s_end * schedule["mask"] + 0.5 * tau * df_mid * default, axis=1)
+    protection = (1 - recovery) * np.sum(df_mid * default, axis=1)
+    return protection - spread * annuity, protection, annuity
+
+def price_cds_batch(discount_curve, hazard_curve, maturity, spread, notional=1.0, recovery_rate=0.4,
+                    payments_per_year=4, names=None, cs01=False):
+    """
+    Prices a book of CDS (protection buyer) in one pass. Trade i references
+    name names[i] of hazard_curve (default: name i, or name 0 for a
+    single-name curve). Returns arrays of value, protection and premium leg
+    PVs, risky annuity, fair spread and, with cs01=True, the value change for
+    a 1bp bump of the name's quoted spreads.
+    """
+    maturity = np.atleast_1d(np.asarray(maturity, dtype=float))
+    n_trades = len(maturity)
+    if names is None:
+        names = np.zeros(n_trades, dtype=int) if len(hazard_curve.rates) == 1 else np.arange(n_trades)
+    names = np.asarray(names)
+    spread = np.broadcast_to(np.asarray(spread, dtype=float), (n_trades,))
+    notional = np.broadcast_to(np.asarray(notional, dtype=float), (n_trades,))
+    recovery = np.broadcast_to(np.asarray(recovery_rate, dtype=float), (n_trades,))
+
+    schedule = cds_schedule(maturity, payments_per_year)
+    value, protection, annuity = _cds_legs(discount_curve, hazard_curve, schedule, names, recovery, spread)
+    result = {
+        "value": notional * value,
+        "protection_leg": notional * protection,
+        "premium_leg": notional * spread * annuity,
+        "risky_annuity": annuity,
+        "fair_spread": protection / annuity,
+    }
+    if cs01:
+        bumped = _cds_legs(discount_curve, hazard_curve.bumped(1e-4), schedule, names, recovery, spread)[0]
+        result["cs01"] = notional * (bumped - value)
+    return result
+
 def main():
     print("Credit Default Swap (CDS) Fair Spread Calculator\n")
     notional = float(input("Enter notional amount: "))
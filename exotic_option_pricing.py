@@ -1,31 +1,251 @@
 import numpy as np
 
-def generate_price_paths(S0, r, sigma, T, steps, n_paths):
-    dt = T / steps
-    paths = np.zeros((n_paths, steps + 1))
-    paths[:, 0] = S0
+import kernels
+from instrumentation import phase
+from monte_carlo import combine_moments
+from stochastic_vol_model import greek_estimates
+import variance_reduction as vr
 
-    Z = np.random.standard_normal((n_paths, steps))
-    for t in range(1, steps + 1):
-        paths[:, t] = paths[:, t - 1] * np.exp((r - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * Z[:, t - 1])
+def generate_price_paths(S0, r, sigma, T, steps, n_paths, method="plain", rng=None):
+    dt = T / steps
+    with phase("generate_price_paths.rng") as p:
+        Z = vr.standard_normals(n_paths, steps, method, rng)
+        p.add(draws=Z.size, bytes=Z.nbytes)
+    with phase("generate_price_paths.stepping", path_steps=n_paths * steps) as p:
+        paths = kernels.gbm_paths(S0, (r - 0.5 * sigma ** 2) * dt, sigma * np.sqrt(dt), Z)
+        p.add(bytes=paths.nbytes)
     return paths
 
-def price_asian_call(paths, K, r, T):
+# Discounted mean of the payoffs, optionally with its standard error
+def discounted_estimate(payoff, r, T, return_stderr, antithetic):
+    price, stderr = vr.mc_estimate(np.exp(-r * T) * payoff, antithetic)
+    return (price, stderr) if return_stderr else price
+
+# Quantities shared by the pathwise and likelihood-ratio estimators, recovered
+# from GBM paths: the normals Z, d S_t / d sigma and the S0 score of the first step
+def _gbm_path_derivatives(paths, r, sigma, T):
+    steps = paths.shape[1] - 1
+    dt = T / steps
+    S0 = paths[:, 0]
+    Z = (np.diff(np.log(paths), axis=1) - (r - 0.5 * sigma ** 2) * dt) / (sigma * np.sqrt(dt))
+    W = np.cumsum(Z, axis=1) * np.sqrt(dt)
+    t = dt * np.arange(1, steps + 1)
+    dS_dsigma = paths[:, 1:] * (W - sigma * t)
+    score_S0 = Z[:, 0] / (S0 * sigma * np.sqrt(dt))
+    return S0, Z, dt, dS_dsigma, score_S0
+
+def price_asian_call(paths, K, r, T, return_stderr=False, antithetic=False, control_variate=False, sigma=None,
+                     greeks=False):
+    """
+    With greeks=True (needs sigma) returns a dict with price, delta, gamma,
+    vega and their standard errors: pathwise delta and vega, and a
+    pathwise-likelihood-ratio gamma. control_variate applies to the price.
+    """
     avg_price = np.mean(paths[:, 1:], axis=1)
     payoff = np.maximum(avg_price - K, 0)
-    return np.exp(-r * T) * np.mean(payoff)
+    if control_variate:
+        # Geometric-average Asian call has a closed form and is highly correlated
+        if sigma is None:
+            raise ValueError("sigma is required for the geometric Asian control variate")
+        steps = paths.shape[1] - 1
+        geo_payoff = np.maximum(np.exp(np.mean(np.log(paths[:, 1:]), axis=1)) - K, 0)
+        geo_price = vr.geometric_asian_call_price(paths[0, 0], K, r, sigma, T, steps)
+        controlled = vr.control_variate(payoff, geo_payoff, geo_price * np.exp(r * T), antithetic)
+    else:
+        controlled = payoff
+    if greeks:
+        discount = np.exp(-r * T)
+        S0, _, _, dS_dsigma, score_S0 = _gbm_path_derivatives(paths, r, sigma, T)
+        in_money = avg_price > K
+        delta = discount * in_money * avg_price / S0
+        return greek_estimates({
+            "price": discount * controlled,
+            "delta": delta,
+            "gamma": delta * (score_S0 - 1 / S0),
+            "vega": discount * in_money * np.mean(dS_dsigma, axis=1),
+        }, antithetic)
+    return discounted_estimate(controlled, r, T, return_stderr, antithetic)
 
-def price_barrier_call(paths, K, B, r, T):
+def price_barrier_call(paths, K, B, r, T, return_stderr=False, antithetic=False, sigma=None, greeks=False):
+    """
+    With greeks=True (needs sigma) returns a dict with price, delta, gamma,
+    vega and their standard errors. The knock-out makes the payoff
+    discontinuous, so all three use likelihood-ratio weights.
+    """
     hit_barrier = np.any(paths >= B, axis=1)
     final_price = paths[:, -1]
     payoff = np.where(~hit_barrier, np.maximum(final_price - K, 0), 0)
-    return np.exp(-r * T) * np.mean(payoff)
+    if greeks:
+        discounted = np.exp(-r * T) * payoff
+        S0, Z, dt, _, score_S0 = _gbm_path_derivatives(paths, r, sigma, T)
+        Z1 = Z[:, 0]
+        gamma_weight = (Z1 ** 2 - 1) / (S0 * sigma) ** 2 / dt - Z1 / (S0 ** 2 * sigma * np.sqrt(dt))
+        vega_weight = np.sum((Z ** 2 - 1) / sigma - Z * np.sqrt(dt), axis=1)
+        return greek_estimates({
+            "price": discounted,
+            "delta": discounted * score_S0,
+            "gamma": discounted * gamma_weight,
+            "vega": discounted * vega_weight,
+        }, antithetic)
+    return discounted_estimate(payoff, r, T, return_stderr, antithetic)
 
-def price_lookback_call(paths, r, T):
+def price_lookback_call(paths, r, T, return_stderr=False, antithetic=False, sigma=None, greeks=False):
+    """
+    With greeks=True (needs sigma) returns a dict with price, delta, gamma,
+    vega and their standard errors, all pathwise. The payoff is homogeneous
+    of degree one in S0, so gamma is exactly zero.
+    """
     min_price = np.min(paths[:, 1:], axis=1)
     final_price = paths[:, -1]
     payoff = final_price - min_price
-    return np.exp(-r * T) * np.mean(payoff)
+    if greeks:
+        discount = np.exp(-r * T)
+        S0, _, _, dS_dsigma, _ = _gbm_path_derivatives(paths, r, sigma, T)
+        argmin = np.argmin(paths[:, 1:], axis=1)
+        rows = np.arange(len(paths))
+        return greek_estimates({
+            "price": discount * payoff,
+            "delta": discount * payoff / S0,
+            "gamma": np.zeros_like(payoff),
+            "vega": discount * (dS_dsigma[:, -1] - dS_dsigma[rows, argmin]),
+        }, antithetic)
+    return discounted_estimate(payoff, r, T, return_stderr, antithetic)
+
+# =================== STREAMING MULTI-PAYOFF PIPELINE ===================
+# Accumulators keep O(n_paths) running statistics while paths are stepped
+# through time, then turn them into a (n_paths, n_instruments) payoff block.
+# Pass a name to tell apart several accumulators of the same kind.
+
+class AsianCalls:
+    """Arithmetic-average calls (average over the monitoring dates after t=0)."""
+    name = "asian_call"
+
+    def __init__(self, strikes, name=None):
+        self.strikes = np.atleast_1d(np.asarray(strikes, dtype=float))
+        self.name = name or self.name
+
+    def start(self, S, dt, sigma):
+        self.total = np.zeros_like(S)
+        self.steps = 0
+
+    def update(self, S_prev, S):
+        self.total += S
+        self.steps += 1
+
+    def payoffs(self, S_T):
+        return np.maximum((self.total / self.steps)[:, None] - self.strikes[None, :], 0)
+
+class LookbackCalls:
+    """Floating-strike lookback calls S_T - min(S_t), minimum over dates after t=0."""
+    name = "lookback_call"
+
+    def __init__(self, name=None):
+        self.name = name or self.name
+
+    def start(self, S, dt, sigma):
+        self.running_min = np.full_like(S, np.inf)
+
+    def update(self, S_prev, S):
+        np.minimum(self.running_min, S, out=self.running_min)
+
+    def payoffs(self, S_T):
+        return (S_T - self.running_min)[:, None]
+
+class UpAndOutCalls:
+    """
+    Up-and-out calls for (strike, barrier) pairs, knocked out when S >= B.
+
+    monitoring: 'discrete' checks the simulation dates (as price_barrier_call),
+    'continuity' approximates a continuous barrier by shifting it down by
+    exp(-0.5826 sigma sqrt(dt)) (Broadie-Glasserman-Kou), and 'bridge' weights
+    each path by its Brownian-bridge probability of not crossing between dates.
+    """
+    name = "barrier_call"
+
+    def __init__(self, strikes, barriers, monitoring="discrete", name=None):
+        if monitoring not in ("discrete", "continuity", "bridge"):
+            raise ValueError(f"Unknown barrier monitoring: {monitoring!r}")
+        self.strikes, self.barriers = np.broadcast_arrays(np.atleast_1d(np.asarray(strikes, dtype=float)),
+                                                          np.atleast_1d(np.asarray(barriers, dtype=float)))
+        self.monitoring = monitoring
+        self.name = name or self.name
+        # Paths only track one survival column per distinct barrier level
+        self.levels, self.level_index = np.unique(self.barriers, return_inverse=True)
+
+    def start(self, S, dt, sigma):
+        if self.monitoring == "bridge":
+            self.log_levels = np.log(self.levels)[None, :]
+            self.scale = -2 / (sigma ** 2 * dt)
+            self.survival = (S[:, None] < self.levels[None, :]).astype(float)
+            self.log_S = np.log(S)[:, None]
+        else:
+            self.running_max = S.copy()
+            self.effective_levels = self.levels * (np.exp(-0.5826 * sigma * np.sqrt(dt)) if self.monitoring == "continuity" else 1.0)
+
+    def update(self, S_prev, S):
+        if self.monitoring == "bridge":
+            log_S = np.log(S)[:, None]
+            below_prev = self.log_levels - self.log_S
+            below = self.log_levels - log_S
+            # P(no crossing | endpoints below B) = 1 - exp(-2 ln(B/S_a) ln(B/S_b) / (sigma^2 dt))
+            self.survival *= np.where(below > 0, 1 - np.exp(self.scale * below_prev * below), 0.0)
+            self.log_S = log_S
+        else:
+            np.maximum(self.running_max, S, out=self.running_max)
+
+    def payoffs(self, S_T):
+        if self.monitoring == "bridge":
+            survival = self.survival[:, self.level_index]
+        else:
+            survival = (self.running_max[:, None] < self.effective_levels[None, self.level_index]).astype(float)
+        return survival * np.maximum(S_T[:, None] - self.strikes[None, :], 0)
+
+# Results are keyed by accumulator name, so two instrument sets sharing a
+# name (e.g. two UpAndOutCalls with the default one) would merge silently
+def instrument_moments(names):
+    names = list(names)
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate instrument names {duplicates}; pass name= to tell them apart")
+    return {name: (0, 0.0, 0.0) for name in names}
+
+def price_exotics_streaming(S0, r, sigma, T, steps, n_paths, accumulators, chunk_size=50_000, rng=None):
+    """
+    Simulates GBM paths chunk by chunk and step by step, feeding every
+    accumulator; memory is O(chunk_size x instruments). Returns
+    {accumulator name: (prices, standard errors)} with one entry per instrument.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    dt = T / steps
+    drift = (r - 0.5 * sigma ** 2) * dt
+    vol = sigma * np.sqrt(dt)
+    discount = np.exp(-r * T)
+    moments = instrument_moments(acc.name for acc in accumulators)
+
+    done = 0
+    while done < n_paths:
+        n = min(chunk_size, n_paths - done)
+        S = np.full(n, float(S0))
+        for acc in accumulators:
+            acc.start(S, dt, sigma)
+
+        for _ in range(steps):
+            S_next = S * np.exp(drift + vol * rng.standard_normal(n))
+            for acc in accumulators:
+                acc.update(S, S_next)
+            S = S_next
+
+        for acc in accumulators:
+            payoff = discount * acc.payoffs(S)
+            mean = payoff.mean(axis=0)
+            block = (n, mean, np.sum((payoff - mean) ** 2, axis=0))
+            moments[acc.name] = combine_moments(moments[acc.name], block)
+        done += n
+
+    results = {}
+    for name, (count, mean, m2) in moments.items():
+        results[name] = (mean, np.sqrt(m2 / (count - 1) / count))
+    return results
 
 def main():
     print("Exotic Option Pricing (Monte Carlo) — With Days to Expiration\n")
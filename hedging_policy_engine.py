@@ -0,0 +1,190 @@
+import numpy as np
+
+from normal_distribution import norm_cdf
+from ptf_hedging_simulation import black_scholes_call, pnl_summary
+
+POLICY_KINDS = ("time", "delta_band", "whalley_wilmott", "gamma_band")
+
+# === Shared Market Simulation ===
+def simulate_hedging_market(S0, K, T_days, r, sigma, n_paths=10_000, dt_days=1, mu=None, hedge_sigma=None, rng=None):
+    """
+    Simulates GBM paths once on the rebalancing grid and precomputes the
+    call delta and gamma at every date, so any number of hedging policies
+    can be evaluated on the same paths and Greeks.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    mu = r if mu is None else mu
+    hedge_sigma = sigma if hedge_sigma is None else hedge_sigma
+    T = T_days / 365
+    times = np.append(np.arange(0, T_days, dt_days), T_days) / 365
+    dt = np.diff(times)
+
+    log_increments = (mu - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * rng.standard_normal((n_paths, len(dt)))
+    S = np.empty((n_paths, len(times)))
+    S[:, 0] = S0
+    S[:, 1:] = S0 * np.exp(np.cumsum(log_increments, axis=1))
+
+    # Greeks on every date before expiry (the expiry column is never traded on)
+    tau = T - times[:-1]
+    sqrt_tau = hedge_sigma * np.sqrt(tau)
+    d1 = (np.log(S[:, :-1] / K) + (r + 0.5 * hedge_sigma ** 2) * tau) / sqrt_tau
+    delta = norm_cdf(d1)
+    gamma = np.exp(-0.5 * d1 ** 2) / np.sqrt(2 * np.pi) / (S[:, :-1] * sqrt_tau)
+
+    premium, _ = black_scholes_call(S0, K, T, r, hedge_sigma)
+    return {"S": S, "delta": delta, "gamma": gamma, "times": times, "T": T, "K": K, "r": r,
+            "sigma": hedge_sigma, "premium": float(premium)}
+
+# === Policies ===
+# A policy is (kind, parameter):
+#   time             rebalance to delta every `parameter` dates
+#   delta_band       rebalance to delta when |hedge - delta| > parameter
+#   whalley_wilmott  keep the hedge inside delta +/- (3/2 e^{-r tau} cost S gamma^2 / parameter)^(1/3),
+#                    trading only to the nearest band edge; parameter is the risk aversion
+#   gamma_band       rebalance to delta when |hedge - delta| exceeds parameter one-date
+#                    standard deviations of delta (gamma S sigma sqrt(dt))
+def check_policy(kind, value):
+    if kind not in POLICY_KINDS:
+        raise ValueError(f"Unknown hedging policy: {kind!r}")
+    if kind == "time" and not (float(value).is_integer() and value >= 1):
+        raise ValueError(f"time policy needs a positive whole number of dates, got {value!r}")
+    if not value > 0:
+        raise ValueError(f"{kind} policy needs a parameter > 0, got {value!r}")
+
+def policy_grid(**params):
+    grid = []
+    for kind, values in params.items():
+        for value in values:
+            check_policy(kind, value)
+        grid += [(kind, value) for value in values]
+    return grid
+
+def run_hedging_policies(market, policies, cost_rate=0.0):
+    """
+    Hedges every path under every policy at once, on (n_paths, n_policies)
+    arrays. Returns the cost-free hedged PnL, the traded notional carried to
+    expiry, the number of trades and the trade count carried to expiry (what
+    a fixed fee of 1 per trade is worth at T), each (n_paths, n_policies).
+    cost_rate only sets the Whalley-Wilmott band width.
+    """
+    S, delta, gamma, times = market["S"], market["delta"], market["gamma"], market["times"]
+    r, T, sigma = market["r"], market["T"], market["sigma"]
+    for kind, value in policies:
+        check_policy(kind, value)
+    kinds = np.array([kind for kind, _ in policies])
+    params = np.array([value for _, value in policies], dtype=float)
+    columns = {kind: np.flatnonzero(kinds == kind) for kind in POLICY_KINDS}
+
+    # Initial hedge, paid for like any other trade
+    hedge = np.repeat(delta[:, :1], len(policies), axis=1)
+    cash = market["premium"] - hedge * S[:, :1]
+    traded = np.abs(hedge) * S[:, :1] * np.exp(r * T)
+    trades = np.ones_like(hedge)
+    fixed_fv = np.full_like(hedge, np.exp(r * T))
+
+    for i in range(1, len(times) - 1):
+        cash *= np.exp(r * (times[i] - times[i - 1]))
+        target = delta[:, i:i + 1]
+        spot = S[:, i:i + 1]
+        off = np.abs(hedge - target)
+        new_hedge = hedge.copy()
+
+        cols = columns["time"]
+        if len(cols):
+            due = (i % params[cols].astype(int)) == 0
+            new_hedge[:, cols] = np.where(due, target, hedge[:, cols])
+
+        cols = columns["delta_band"]
+        if len(cols):
+            new_hedge[:, cols] = np.where(off[:, cols] > params[cols], target, hedge[:, cols])
+
+        cols = columns["whalley_wilmott"]
+        if len(cols):
+            width = (1.5 * np.exp(-r * (T - times[i])) * cost_rate * spot * gamma[:, i:i + 1] ** 2 / params[cols]) ** (1 / 3)
+            new_hedge[:, cols] = np.clip(hedge[:, cols], target - width, target + width)
+
+        cols = columns["gamma_band"]
+        if len(cols):
+            dt = times[i + 1] - times[i]
+            width = params[cols] * gamma[:, i:i + 1] * spot * sigma * np.sqrt(dt)
+            new_hedge[:, cols] = np.where(off[:, cols] > width, target, hedge[:, cols])
+
+        trade = new_hedge - hedge
+        cash -= trade * spot
+        traded += np.abs(trade) * spot * np.exp(r * (T - times[i]))
+        trades += trade != 0
+        fixed_fv += (trade != 0) * np.exp(r * (T - times[i]))
+        hedge = new_hedge
+
+    cash *= np.exp(r * (times[-1] - times[-2]))
+    S_T = S[:, -1:]
+    pnl = cash + hedge * S_T - np.maximum(S_T - market["K"], 0)
+    return pnl, traded, trades, fixed_fv
+
+def sweep_hedging_policies(market, policies, costs=((0.0, 0.0),)):
+    """
+    Evaluates every policy under every (proportional rate, fixed cost per
+    trade) setting on the same paths. Costs are charged on all trades up to
+    expiry (not on the final unwind) and carried to expiry at r. Policies that
+    do not depend on costs are simulated once. Returns one row per
+    (policy, cost) pair.
+    """
+    cost_free = [p for p in policies if p[0] != "whalley_wilmott"]
+    cost_aware = [p for p in policies if p[0] == "whalley_wilmott"]
+
+    shared = run_hedging_policies(market, cost_free) if cost_free else None
+
+    rows = []
+    for cost_rate, fixed_cost in costs:
+        runs = [(cost_free, shared)] if cost_free else []
+        if cost_aware:
+            runs.append((cost_aware, run_hedging_policies(market, cost_aware, cost_rate)))
+
+        for group, (pnl, traded, trades, fixed_fv) in runs:
+            costs_paid = cost_rate * traded + fixed_cost * fixed_fv
+            net = pnl - costs_paid
+            for j, (kind, value) in enumerate(group):
+                summary = pnl_summary(net[:, j], market["premium"])
+                rows.append({
+                    "policy": kind,
+                    "parameter": value,
+                    "cost_rate": cost_rate,
+                    "fixed_cost": fixed_cost,
+                    "mean_cost": np.mean(costs_paid[:, j]),
+                    "hedging_error_std": np.std(pnl[:, j], ddof=1),
+                    "net_mean": summary["mean"],
+                    "net_std": summary["std"],
+                    "net_es05": summary["es05"],
+                    "trades": np.mean(trades[:, j]),
+                })
+    return rows
+
+def format_policy_table(rows):
+    header = (f"{'policy':<17}{'param':>9}{'cost %':>8}{'fixed':>7}{'mean cost':>11}{'hedge err':>11}"
+              f"{'net mean':>10}{'net std':>9}{'ES 5%':>9}{'trades':>8}")
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        lines.append(f"{row['policy']:<17}{row['parameter']:>9.4g}{row['cost_rate'] * 100:>8.3f}{row['fixed_cost']:>7.3g}"
+                     f"{row['mean_cost']:>11.4f}{row['hedging_error_std']:>11.4f}{row['net_mean']:>10.4f}"
+                     f"{row['net_std']:>9.4f}{row['net_es05']:>9.4f}{row['trades']:>8.1f}")
+    return "\n".join(lines)
+
+def main():
+    print("Hedging Policy Comparison — Transaction Costs vs Hedging Error\n")
+    S0 = float(input("Initial stock price: "))
+    K = float(input("Option strike price: "))
+    T_days = int(input("Days to expiration: "))
+    r = float(input("Risk-free rate (e.g. 0.01): "))
+    sigma = float(input("Volatility (e.g. 0.2): "))
+    n_paths = int(input("Number of paths (e.g. 10000): "))
+    cost_rate = float(input("Proportional cost rate (e.g. 0.001): "))
+    fixed_cost = float(input("Fixed cost per trade (e.g. 0.01): "))
+
+    market = simulate_hedging_market(S0, K, T_days, r, sigma, n_paths)
+    policies = policy_grid(time=[1, 2, 5, 10], delta_band=[0.01, 0.02, 0.05, 0.1],
+                           whalley_wilmott=[0.1, 1, 10], gamma_band=[0.5, 1, 2, 4])
+    rows = sweep_hedging_policies(market, policies, [(0.0, 0.0), (cost_rate, fixed_cost)])
+    print(format_policy_table(rows))
+
+if __name__ == "__main__":
+    main()
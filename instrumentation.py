@@ -0,0 +1,171 @@
+import atexit
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+
+# Opt-in phase timers and counters for the simulation and tree engines.
+# Engines wrap their hot phases (RNG draws, stepping, payoff reduction) in
+#   with phase("heston_simulation.rng") as p:
+#       ...
+#       p.add(draws=Z.size, bytes=Z.nbytes)
+# and every finished phase goes to the enabled sinks. With no sink enabled
+# phase() returns a shared no-op object, so the hooks cost one global check.
+# QUANTFINANCE_TRACE=trace.json records a Chrome trace of the whole process.
+
+_sinks = ()
+_local = threading.local()
+
+def enable(*sinks):
+    """Sends phases to the given sinks (in addition to any already enabled)."""
+    global _sinks
+    _sinks = _sinks + tuple(sink for sink in sinks if sink not in _sinks)
+
+def disable(*sinks):
+    """Stops sending to the given sinks, or to every sink when none are given."""
+    global _sinks
+    _sinks = tuple(sink for sink in _sinks if sink not in sinks) if sinks else ()
+
+def is_enabled():
+    return bool(_sinks)
+
+@contextlib.contextmanager
+def instrumented(*sinks):
+    enable(*sinks)
+    try:
+        yield sinks[0] if len(sinks) == 1 else sinks
+    finally:
+        disable(*sinks)
+
+# =================== PHASES ===================
+
+class _Phase:
+    __slots__ = ("name", "counters", "start", "depth")
+
+    def __init__(self, name, counters):
+        self.name = name
+        self.counters = counters
+
+    def add(self, **counters):
+        for key, value in counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def __enter__(self):
+        self.depth = getattr(_local, "depth", 0)
+        _local.depth = self.depth + 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter() - self.start
+        _local.depth = self.depth
+        event = {"name": self.name, "start": self.start, "duration": duration, "counters": self.counters,
+                 "thread": threading.get_ident(), "depth": self.depth}
+        for sink in _sinks:
+            sink.record(event)
+        return False
+
+class _NullPhase:
+    __slots__ = ()
+
+    def add(self, **counters):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_PHASE = _NullPhase()
+
+def phase(name, **counters):
+    if not _sinks:
+        return _NULL_PHASE
+    return _Phase(name, counters)
+
+# =================== SINKS ===================
+# A sink is any object with record(event); event holds name, start and
+# duration (perf_counter seconds), counters, thread and nesting depth.
+
+class LoggingSink:
+    def __init__(self, logger=None, level=logging.INFO):
+        self.logger = logger or logging.getLogger("quantfinance.instrumentation")
+        self.level = level
+
+    def record(self, event):
+        if self.logger.isEnabledFor(self.level):
+            counters = " ".join(f"{key}={value:,}" for key, value in event["counters"].items())
+            self.logger.log(self.level, "%s%s %.3f ms %s", "  " * event["depth"], event["name"],
+                            1e3 * event["duration"], counters)
+
+class StatsSink:
+    """In-memory totals per phase name: calls, total / min / max seconds and summed counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {}
+
+    def record(self, event):
+        with self._lock:
+            entry = self.stats.get(event["name"])
+            if entry is None:
+                entry = self.stats[event["name"]] = {"calls": 0, "seconds": 0.0, "min_seconds": float("inf"),
+                                                      "max_seconds": 0.0, "counters": {}}
+            entry["calls"] += 1
+            entry["seconds"] += event["duration"]
+            entry["min_seconds"] = min(entry["min_seconds"], event["duration"])
+            entry["max_seconds"] = max(entry["max_seconds"], event["duration"])
+            for key, value in event["counters"].items():
+                entry["counters"][key] = entry["counters"].get(key, 0) + value
+
+    def clear(self):
+        with self._lock:
+            self.stats = {}
+
+    def summary(self):
+        lines = [f"{'phase':<40}{'calls':>8}{'total ms':>12}{'mean ms':>10}   counters"]
+        for name, entry in sorted(self.stats.items(), key=lambda item: -item[1]["seconds"]):
+            counters = " ".join(f"{key}={value:,}" for key, value in entry["counters"].items())
+            lines.append(f"{name:<40}{entry['calls']:>8}{1e3 * entry['seconds']:>12.2f}"
+                         f"{1e3 * entry['seconds'] / entry['calls']:>10.3f}   {counters}")
+        return "\n".join(lines)
+
+class ChromeTraceSink:
+    """
+    Collects phases as Chrome trace 'complete' events; open the written file
+    in chrome://tracing or Perfetto. Nested phases show as nested slices.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.events = []
+        self._origin = time.perf_counter()
+
+    def record(self, event):
+        self.events.append({
+            "name": event["name"],
+            "cat": event["name"].split(".")[0],
+            "ph": "X",
+            "ts": 1e6 * (event["start"] - self._origin),
+            "dur": 1e6 * event["duration"],
+            "pid": os.getpid(),
+            "tid": event["thread"],
+            "args": dict(event["counters"]),
+        })
+
+    def to_json(self):
+        return {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+
+    def write(self, path=None):
+        path = path or self.path
+        with open(path, "w") as f:
+            json.dump(self.to_json(), f)
+        return path
+
+if os.environ.get("QUANTFINANCE_TRACE"):
+    _trace = ChromeTraceSink(os.environ["QUANTFINANCE_TRACE"])
+    enable(_trace)
+    atexit.register(_trace.write)
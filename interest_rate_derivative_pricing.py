@@ -1,5 +1,7 @@
 import numpy as np
-from scipy.stats import norm
+
+from normal_distribution import norm_cdf
+from verbosity import report
 
 # Simple discount factor from flat yield curve
 def discount_factor(rate, t):
@@ -9,13 +11,13 @@ def discount_factor(rate, t):
 def price_swap(notional, fixed_rate, float_rate, maturity, payments_per_year, discount_rate):
     dt = 1 / payments_per_year
     times = np.arange(dt, maturity + dt, dt)
-    df = np.array([discount_factor(discount_rate, t) for t in times])
+    df = discount_factor(discount_rate, times)
 
     fixed_leg = np.sum(fixed_rate * notional * dt * df)
     float_leg = np.sum(float_rate * notional * dt * df)  # assuming constant fwd rate
 
     swap_value = float_leg - fixed_leg
-    print(f"💼 Interest Rate Swap Value: {swap_value:.4f}")
+    report(f"💼 Interest Rate Swap Value: {swap_value:.4f}")
     return swap_value
 
 # Black's model for cap/floorlet pricing
@@ -25,9 +27,9 @@ def black_caplet_price(F, K, T, sigma, r, notional, is_cap=True):
 
     df = discount_factor(r, T)
     if is_cap:
-        price = df * notional * (F * norm.cdf(d1) - K * norm.cdf(d2))
+        price = df * notional * (F * norm_cdf(d1) - K * norm_cdf(d2))
     else:
-        price = df * notional * (K * norm.cdf(-d2) - F * norm.cdf(-d1))
+        price = df * notional * (K * norm_cdf(-d2) - F * norm_cdf(-d1))
 
     return price
 
@@ -36,15 +38,181 @@ def price_cap_floor(notional, strike, forward_rate, maturity, payments_per_year,
     dt = 1 / payments_per_year
     times = np.arange(dt, maturity + dt, dt)
 
-    total = 0
-    for T in times:
-        price = black_caplet_price(forward_rate, strike, T, sigma, r, notional * dt, is_cap)
-        total += price
+    total = np.sum(black_caplet_price(forward_rate, strike, times, sigma, r, notional * dt, is_cap))
 
     label = "Cap" if is_cap else "Floor"
-    print(f"🎯 {label} Value: {total:.4f}")
+    report(f"🎯 {label} Value: {total:.4f}")
     return total
 
+# =================== YIELD CURVE ===================
+
+class YieldCurve:
+    """
+    Discount curve on pillar times, interpolated log-linearly in the discount
+    factor (piecewise-flat instantaneous forwards) and extrapolated with the
+    last forward. Book pricers discount once on the shared schedule grid
+    rather than once per trade.
+    """
+
+    def __init__(self, times, discount_factors):
+        times = np.asarray(times, dtype=float)
+        discount_factors = np.asarray(discount_factors, dtype=float)
+        order = np.argsort(times)
+        times, discount_factors = times[order], discount_factors[order]
+        if times[0] > 0:
+            times = np.insert(times, 0, 0.0)
+            discount_factors = np.insert(discount_factors, 0, 1.0)
+        self.times = times
+        self.log_df = np.log(discount_factors)
+        self.tail_forward = (self.log_df[-2] - self.log_df[-1]) / (times[-1] - times[-2]) if len(times) > 1 else 0.0
+
+    @classmethod
+    def flat(cls, rate, max_maturity=50):
+        return cls([max_maturity], [np.exp(-rate * max_maturity)])
+
+    @classmethod
+    def bootstrap(cls, deposits=(), swaps=(), payments_per_year=2):
+        """
+        Builds the curve from (maturity, simple rate) deposits and
+        (maturity, par rate) fixed-for-floating swaps, solving one pillar per
+        instrument in maturity order. Fixed dates between pillars are priced
+        off the curve itself, so each swap pillar is a 1-D root search.
+        """
+        from scipy.optimize import brentq
+
+        times, dfs = [], []
+        for t, rate in sorted(deposits):
+            times.append(t)
+            dfs.append(1 / (1 + rate * t))
+
+        dt = 1 / payments_per_year
+        for maturity, par_rate in sorted(swaps):
+            fixed_times = np.arange(1, int(round(maturity * payments_per_year)) + 1) * dt
+
+            def par_error(df_T):
+                curve = cls(times + [maturity], dfs + [df_T])
+                df = curve.discount(fixed_times)
+                return par_rate * dt * np.sum(df) - (1 - df_T)
+
+            dfs.append(brentq(par_error, 1e-6, 1.5))
+            times.append(maturity)
+        return cls(times, dfs)
+
+    def discount(self, t):
+        t = np.asarray(t, dtype=float)
+        log_df = np.interp(t, self.times, self.log_df)
+        beyond = t > self.times[-1]
+        if np.any(beyond):
+            log_df = np.where(beyond, self.log_df[-1] - self.tail_forward * (t - self.times[-1]), log_df)
+        return np.exp(log_df)
+
+    def zero_rate(self, t):
+        t = np.asarray(t, dtype=float)
+        return -np.log(self.discount(t)) / np.maximum(t, 1e-12)
+
+    # Simply compounded forward rate over [t1, t2]
+    def forward_rate(self, t1, t2):
+        return (self.discount(t1) / self.discount(t2) - 1) / (np.asarray(t2) - np.asarray(t1))
+
+    def shifted(self, bump):
+        """Curve with all zero rates moved by bump (parallel shift)."""
+        return YieldCurve(self.times, np.exp(self.log_df - bump * self.times))
+
+# =================== PORTFOLIO PRICING ===================
+
+def trade_schedule(maturity, payments_per_year, start=0.0):
+    """
+    Padded (n_trades, max_periods) payment schedule for a book of trades.
+    Payment dates are mapped onto one sorted grid of unique times, so a curve
+    is interpolated once per book whatever the number of trades. Build it once
+    and reuse it across curve scenarios.
+    """
+    # Books repeat a handful of standard terms: lay out each distinct term once
+    terms, trade_terms = unique_terms(maturity, payments_per_year, start)
+    maturity, payments_per_year, start = terms
+    dt = 1 / payments_per_year
+    n_periods = np.rint((maturity - start) * payments_per_year).astype(int)
+    k = np.arange(1, n_periods.max() + 1)
+    mask = k <= n_periods[:, None]
+    end = np.where(mask, start[:, None] + k * dt[:, None], 0.0)
+    begin = np.where(mask, end - dt[:, None], 0.0)
+
+    # Rounding merges dates that only differ by floating-point noise
+    grid, index = np.unique(np.round(np.concatenate([begin, end], axis=1), 10), return_inverse=True)
+    index = index.reshape(len(maturity), -1)[trade_terms]
+    n_max = mask.shape[1]
+    return {
+        "grid": grid,
+        "begin_index": index[:, :n_max],
+        "end_index": index[:, n_max:],
+        "accrual": np.where(mask, dt[:, None], 0.0)[trade_terms],
+        "mask": mask[trade_terms],
+    }
+
+def unique_terms(*columns):
+    """Distinct rows of broadcast per-trade columns (one array per column) and each trade's row."""
+    columns = np.broadcast_arrays(*(np.atleast_1d(np.asarray(x, dtype=float)) for x in columns))
+    terms, trade_terms = np.unique(np.stack(columns, axis=1), axis=0, return_inverse=True)
+    return terms.T, trade_terms.ravel()
+
+def _schedule_curve(curve, schedule):
+    df = curve.discount(schedule["grid"])
+    df_begin = df[schedule["begin_index"]]
+    df_end = df[schedule["end_index"]]
+    tau = schedule["accrual"]
+    forward = np.where(schedule["mask"], (df_begin / df_end - 1) / np.where(tau > 0, tau, 1), 0.0)
+    return df_end * schedule["mask"], forward
+
+def price_swaps(curve, notional, fixed_rate, maturity, payments_per_year=2, start=0.0, payer=True, spread=0.0,
+                schedule=None):
+    """
+    Values a book of fixed-for-floating swaps on one curve in a single pass.
+    Returns arrays of value (to the payer of fixed unless payer=False),
+    fixed and floating leg PVs, annuity and par rate.
+    """
+    schedule = trade_schedule(maturity, payments_per_year, start) if schedule is None else schedule
+    df, forward = _schedule_curve(curve, schedule)
+    tau = schedule["accrual"]
+
+    annuity = np.sum(tau * df, axis=1)
+    float_pv = np.sum(tau * (forward + np.asarray(spread)[..., None]) * df, axis=1)
+    notional = np.asarray(notional, dtype=float)
+    fixed_leg = notional * fixed_rate * annuity
+    float_leg = notional * float_pv
+    value = np.where(payer, float_leg - fixed_leg, fixed_leg - float_leg)
+    return {
+        "value": value,
+        "fixed_leg": fixed_leg,
+        "float_leg": float_leg,
+        "annuity": annuity,
+        "par_rate": float_pv / annuity,
+    }
+
+def price_caps_floors(curve, notional, strike, maturity, sigma, payments_per_year=4, start=0.0, is_cap=True,
+                      schedule=None):
+    """
+    Values a book of caps/floors with Black caplets on curve forwards: each
+    caplet fixes at the start of its period and pays at the end. A caplet
+    that has already fixed (start 0) is worth its intrinsic value.
+    """
+    schedule = trade_schedule(maturity, payments_per_year, start) if schedule is None else schedule
+    df, forward = _schedule_curve(curve, schedule)
+    tau = schedule["accrual"]
+    expiry = schedule["grid"][schedule["begin_index"]]
+
+    K = np.asarray(strike, dtype=float)[..., None]
+    is_cap = np.asarray(is_cap)[..., None]
+    vol = np.asarray(sigma, dtype=float)[..., None] * np.sqrt(expiry)
+    live = (vol > 0) & schedule["mask"]
+    safe_vol = np.where(live, vol, 1.0)
+    d1 = (np.log(np.where(live, forward / K, 1.0)) + 0.5 * safe_vol ** 2) / safe_vol
+    d2 = d1 - safe_vol
+
+    call = np.where(live, forward * norm_cdf(d1) - K * norm_cdf(d2), np.maximum(forward - K, 0))
+    put = np.where(live, K * norm_cdf(-d2) - forward * norm_cdf(-d1), np.maximum(K - forward, 0))
+    caplets = np.where(is_cap, call, put) * tau * df
+    return np.asarray(notional, dtype=float) * np.sum(caplets, axis=1)
+
 # Test examples
 def main():
     print("Interest Rate Derivative Pricing\n")
@@ -68,5 +236,13 @@ def main():
     price_cap_floor(notional, strike, forward_rate, maturity, payments_per_year, sigma, r, is_cap=True)   # Cap
     price_cap_floor(notional, strike, forward_rate, maturity, payments_per_year, sigma, r, is_cap=False)  # Floor
 
+    # === Curve-based book ===
+    curve = YieldCurve.bootstrap(deposits=[(0.25, 0.030), (0.5, 0.031)],
+                                 swaps=[(1, 0.032), (2, 0.033), (5, 0.035), (10, 0.037)])
+    swaps = price_swaps(curve, [notional] * 3, [0.033, 0.035, 0.037], [2, 5, 10])
+    caps = price_caps_floors(curve, notional, 0.04, [2, 5, 10], sigma)
+    for m, value, par, cap in zip((2, 5, 10), swaps["value"], swaps["par_rate"], caps):
+        print(f"📈 {m}y payer swap: {value:12.2f}   par {par:.4%}   cap @4%: {cap:10.2f}")
+
 if __name__ == "__main__":
     main()
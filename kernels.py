@@ -0,0 +1,250 @@
+import math
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # the accelerator is optional
+    numba = None
+
+# =================== BACKEND ===================
+# Every kernel has a pure NumPy implementation and a fused-loop version that
+# is JIT-compiled with Numba (parallel over paths / contracts) when Numba is
+# installed. Modules call the public functions below and never need to know
+# which backend runs.
+
+HAVE_NUMBA = numba is not None
+_backend = "numba" if HAVE_NUMBA else "numpy"
+prange = numba.prange if HAVE_NUMBA else range
+
+def set_backend(name):
+    global _backend
+    if name not in ("numpy", "numba"):
+        raise ValueError(f"Unknown kernel backend: {name!r}")
+    if name == "numba" and not HAVE_NUMBA:
+        raise ImportError("The numba backend needs numba to be installed")
+    _backend = name
+
+def get_backend():
+    return _backend
+
+def _jit(fn):
+    # Compiled lazily on first call
+    return numba.njit(parallel=True, cache=True)(fn) if HAVE_NUMBA else None
+
+# =================== GBM PATHS ===================
+
+def gbm_paths(S0, drift, vol, Z):
+    """
+    Paths S0 exp(cumsum(drift + vol Z)) of shape (n_paths, steps + 1) from
+    normals Z of shape (n_paths, steps).
+    """
+    Z = np.ascontiguousarray(Z, dtype=float)
+    if _backend == "numba":
+        out = np.empty((Z.shape[0], Z.shape[1] + 1))
+        _gbm_paths_numba(float(S0), float(drift), float(vol), Z, out)
+        return out
+    return _gbm_paths_numpy(S0, drift, vol, Z)
+
+def _gbm_paths_numpy(S0, drift, vol, Z):
+    paths = np.empty((Z.shape[0], Z.shape[1] + 1))
+    paths[:, 0] = S0
+    log_increments = drift + vol * Z
+    np.cumsum(log_increments, axis=1, out=log_increments)
+    paths[:, 1:] = S0 * np.exp(log_increments)
+    return paths
+
+def _gbm_paths_loop(S0, drift, vol, Z, out):
+    n, steps = Z.shape
+    for p in prange(n):
+        log_s = 0.0
+        out[p, 0] = S0
+        for j in range(steps):
+            log_s += drift + vol * Z[p, j]
+            out[p, j + 1] = S0 * math.exp(log_s)
+
+_gbm_paths_numba = _jit(_gbm_paths_loop)
+
+# =================== HESTON EULER PATHS ===================
+
+def heston_euler_paths(S0, v0, r, kappa, theta, sigma, rho, dt, Z1, W2):
+    """
+    Full-truncation Euler Heston paths (as heston_simulation) from
+    independent normals Z1, W2 of shape (n_paths, steps); the variance
+    shock is rho Z1 + sqrt(1 - rho^2) W2. Returns (S, v), each (n_paths, steps + 1).
+    """
+    Z1 = np.ascontiguousarray(Z1, dtype=float)
+    W2 = np.ascontiguousarray(W2, dtype=float)
+    S = np.empty((Z1.shape[0], Z1.shape[1] + 1))
+    v = np.empty_like(S)
+    args = tuple(float(x) for x in (S0, v0, r, kappa, theta, sigma, rho, dt))
+    if _backend == "numba":
+        _heston_euler_numba(*args, Z1, W2, S, v)
+    else:
+        _heston_euler_numpy(*args, Z1, W2, S, v)
+    return S, v
+
+def _heston_euler_numpy(S0, v0, r, kappa, theta, sigma, rho, dt, Z1, W2, S, v):
+    S[:, 0] = S0
+    v[:, 0] = v0
+    sqrt_dt = np.sqrt(dt)
+    rho_bar = np.sqrt(1 - rho ** 2)
+    vol = np.empty(Z1.shape[0])
+    for t in range(1, Z1.shape[1] + 1):
+        v_prev = v[:, t - 1]
+        np.sqrt(v_prev, out=vol)
+        vol *= sqrt_dt
+        Z2 = rho * Z1[:, t - 1] + rho_bar * W2[:, t - 1]
+        np.maximum(v_prev + kappa * (theta - v_prev) * dt + sigma * vol * Z2, 0, out=v[:, t])
+        S[:, t] = S[:, t - 1] * np.exp((r - 0.5 * v_prev) * dt + vol * Z1[:, t - 1])
+
+def _heston_euler_loop(S0, v0, r, kappa, theta, sigma, rho, dt, Z1, W2, S, v):
+    n, steps = Z1.shape
+    sqrt_dt = math.sqrt(dt)
+    rho_bar = math.sqrt(1 - rho * rho)
+    for p in prange(n):
+        s = S0
+        var = v0
+        S[p, 0] = s
+        v[p, 0] = var
+        for j in range(steps):
+            z1 = Z1[p, j]
+            vol = math.sqrt(var) * sqrt_dt
+            s *= math.exp((r - 0.5 * var) * dt + vol * z1)
+            var = max(var + kappa * (theta - var) * dt + sigma * vol * (rho * z1 + rho_bar * W2[p, j]), 0.0)
+            S[p, j + 1] = s
+            v[p, j + 1] = var
+
+_heston_euler_numba = _jit(_heston_euler_loop)
+
+# =================== BINOMIAL BACKWARD INDUCTION ===================
+
+def american_induction(S, K, u, q, disc, sign, dividends):
+    """
+    CRR backward induction with early exercise for one contract per element
+    of S, K, u, q, disc (1-D arrays). dividends has shape (contracts,
+    steps + 1): the cash dividend deducted from the stock in the exercise
+    value at each step. sign is +1 for calls, -1 for puts.
+    """
+    S, K, u, q, disc = (np.ascontiguousarray(x, dtype=float) for x in (S, K, u, q, disc))
+    dividends = np.ascontiguousarray(dividends, dtype=float)
+    if _backend == "numba":
+        out = np.empty(len(S))
+        _american_induction_numba(S, K, u, q, disc, float(sign), dividends, out)
+        return out
+    return _american_induction_numpy(S, K, u, q, disc, sign, dividends)
+
+def _american_induction_numpy(S, K, u, q, disc, sign, dividends):
+    steps = dividends.shape[1] - 1
+    u, q, disc, K = u[:, None], q[:, None], disc[:, None], K[:, None]
+    d = 1 / u
+    paying = dividends.any(axis=0)
+
+    def exercise_value(stock, step):
+        if paying[step]:
+            stock = np.maximum(stock - dividends[:, step:step + 1], 0)
+        return sign * (stock - K)
+
+    # Terminal layer: node j has (steps - j) up moves and j down moves
+    j = np.arange(steps + 1)
+    stock = S[:, None] * u ** (steps - 2 * j)
+    values = np.maximum(exercise_value(stock, steps), 0)
+
+    # Backward induction over a single rolling layer
+    for i in range(steps - 1, -1, -1):
+        up = values[:, :i + 1]
+        down = values[:, 1:i + 2] * (1 - q)
+        up *= q
+        up += down
+        up *= disc
+        stock_i = stock[:, :i + 1]
+        stock_i *= d
+        np.maximum(up, exercise_value(stock_i, i), out=up)
+
+    return values[:, 0]
+
+def _american_induction_loop(S, K, u, q, disc, sign, dividends, out):
+    n, width = dividends.shape
+    steps = width - 1
+    for c in prange(n):
+        values = np.empty(width)
+        stock = np.empty(width)
+        for j in range(width):
+            stock[j] = S[c] * u[c] ** (steps - 2 * j)
+            values[j] = max(sign * (max(stock[j] - dividends[c, steps], 0.0) - K[c]), 0.0)
+        d = 1.0 / u[c]
+        for i in range(steps - 1, -1, -1):
+            for j in range(i + 1):
+                hold = disc[c] * (q[c] * values[j] + (1.0 - q[c]) * values[j + 1])
+                stock[j] *= d
+                exercise = sign * (max(stock[j] - dividends[c, i], 0.0) - K[c])
+                values[j] = hold if hold > exercise else exercise
+        out[c] = values[0]
+
+_american_induction_numba = _jit(_american_induction_loop)
+
+# =================== RUNNING PATH STATISTICS ===================
+
+def path_statistics(paths):
+    """Arithmetic mean, minimum and maximum of every path over its monitoring dates (columns 1:)."""
+    paths = np.ascontiguousarray(paths, dtype=float)
+    if _backend == "numba":
+        n = paths.shape[0]
+        mean, low, high = np.empty(n), np.empty(n), np.empty(n)
+        _path_statistics_numba(paths, mean, low, high)
+        return mean, low, high
+    monitored = paths[:, 1:]
+    return monitored.mean(axis=1), monitored.min(axis=1), monitored.max(axis=1)
+
+def _path_statistics_loop(paths, mean, low, high):
+    n, width = paths.shape
+    for p in prange(n):
+        total = 0.0
+        lo = np.inf
+        hi = -np.inf
+        for j in range(1, width):
+            x = paths[p, j]
+            total += x
+            lo = min(lo, x)
+            hi = max(hi, x)
+        mean[p] = total / (width - 1)
+        low[p] = lo
+        high[p] = hi
+
+_path_statistics_numba = _jit(_path_statistics_loop)
+
+# =================== SELF-FINANCING HEDGE ===================
+
+def hedge_cash(cash0, holdings, S, growth):
+    """
+    Cash account of a self-financing stock hedge, shape (n_paths, steps + 1):
+    cash_i = cash_{i-1} growth_i + (h_{i-1} - h_i) S_i, with holdings h and
+    prices S of shape (n_paths, steps + 1) and per-period growth factors
+    (steps,) (e.g. exp(r dt)).
+    """
+    holdings = np.atleast_2d(np.asarray(holdings, dtype=float))
+    S = np.atleast_2d(np.asarray(S, dtype=float))
+    cash0 = np.broadcast_to(np.asarray(cash0, dtype=float), holdings.shape[:1])
+    growth = np.broadcast_to(np.asarray(growth, dtype=float), (holdings.shape[1] - 1,))
+    if _backend == "numba":
+        out = np.empty_like(holdings)
+        _hedge_cash_numba(np.ascontiguousarray(cash0), np.ascontiguousarray(holdings), np.ascontiguousarray(S),
+                          np.ascontiguousarray(growth), out)
+        return out
+    # Closed form of the recursion: cash_i = G_i (cash_0 + sum_{k<=i} (h_{k-1} - h_k) S_k / G_k)
+    G = np.concatenate([[1.0], np.cumprod(growth)])
+    flows = np.zeros_like(holdings)
+    flows[:, 0] = cash0
+    flows[:, 1:] = (holdings[:, :-1] - holdings[:, 1:]) * S[:, 1:] / G[1:]
+    return G * np.cumsum(flows, axis=1)
+
+def _hedge_cash_loop(cash0, holdings, S, growth, out):
+    n, width = holdings.shape
+    for p in prange(n):
+        cash = cash0[p]
+        out[p, 0] = cash
+        for i in range(1, width):
+            cash = cash * growth[i - 1] + (holdings[p, i - 1] - holdings[p, i]) * S[p, i]
+            out[p, i] = cash
+
+_hedge_cash_numba = _jit(_hedge_cash_loop)
@@ -1,45 +1,62 @@
+from statistics import NormalDist
+
 import numpy as np
-import matplotlib.pyplot as plt
 
-def monte_carlo_option_pricing(S, K, days, r, sigma, simulations=100000, steps=100):
-    print("\n--- Monte Carlo Simulation for European Options ---")
-    print(f"Spot Price (S): {S}")
-    print(f"Strike Price (K): {K}")
-    print(f"Days to Expiration: {days}")
+import kernels
+import variance_reduction as vr
+from instrumentation import phase
+from verbosity import report
+
+def monte_carlo_option_pricing(S, K, days, r, sigma, simulations=100000, steps=100, plot=False, rng=None):
+    report("\n--- Monte Carlo Simulation for European Options ---")
+    report(f"Spot Price (S): {S}")
+    report(f"Strike Price (K): {K}")
+    report(f"Days to Expiration: {days}")
     T = days / 360
-    print(f"Converted Time to Maturity (T in years): {T:.6f}")
-    print(f"Risk-free Rate (r): {r}")
-    print(f"Volatility (sigma): {sigma}")
-    print(f"Number of Simulations: {simulations}")
-    print(f"Time Steps per Path: {steps}\n")
+    report(f"Converted Time to Maturity (T in years): {T:.6f}")
+    report(f"Risk-free Rate (r): {r}")
+    report(f"Volatility (sigma): {sigma}")
+    report(f"Number of Simulations: {simulations}")
+    report(f"Time Steps per Path: {steps}\n")
 
     dt = T / steps
-    np.random.seed(42)
+    if rng is None:
+        np.random.seed(42)
+        rng = np.random
 
     # Generate price paths
-    Z = np.random.standard_normal((simulations, steps))
-    ST_paths = np.zeros_like(Z)
-    ST_paths[:, 0] = S
+    with phase("monte_carlo_option_pricing.rng") as p:
+        Z = rng.standard_normal((simulations, steps))
+        p.add(draws=Z.size, bytes=Z.nbytes)
+    with phase("monte_carlo_option_pricing.stepping", path_steps=simulations * (steps - 1)) as p:
+        ST_paths = kernels.gbm_paths(S, (r - 0.5 * sigma**2) * dt, sigma * np.sqrt(dt), Z[:, 1:])
+        p.add(bytes=ST_paths.nbytes)
+
+    with phase("monte_carlo_option_pricing.payoff", paths=simulations):
+        # Final simulated prices
+        ST = ST_paths[:, -1]
+
+        # Payoffs
+        call_payoff = np.maximum(ST - K, 0)
+        put_payoff = np.maximum(K - ST, 0)
 
-    for t in range(1, steps):
-        ST_paths[:, t] = ST_paths[:, t - 1] * np.exp((r - 0.5 * sigma**2) * dt + sigma * np.sqrt(dt) * Z[:, t])
+        call_price = np.exp(-r * T) * np.mean(call_payoff)
+        put_price = np.exp(-r * T) * np.mean(put_payoff)
 
-    # Final simulated prices
-    ST = ST_paths[:, -1]
+    report(f"📈 Estimated Call Option Price: {call_price:.4f}")
+    report(f"📉 Estimated Put Option Price:  {put_price:.4f}")
 
-    # Payoffs
-    call_payoff = np.maximum(ST - K, 0)
-    put_payoff = np.maximum(K - ST, 0)
+    if plot:
+        plot_paths(ST_paths, days, steps)
 
-    call_price = np.exp(-r * T) * np.mean(call_payoff)
-    put_price = np.exp(-r * T) * np.mean(put_payoff)
+    return call_price, put_price
 
-    print(f"📈 Estimated Call Option Price: {call_price:.4f}")
-    print(f"📉 Estimated Put Option Price:  {put_price:.4f}")
+# Plotting a sample of simulated paths (matplotlib is only imported here)
+def plot_paths(ST_paths, days, steps, n_plot=1000):
+    import matplotlib.pyplot as plt
 
-    # Plotting a sample of simulated paths
     plt.figure(figsize=(10, 6))
-    for i in range(min(1000, simulations)):
+    for i in range(min(n_plot, len(ST_paths))):
         plt.plot(np.linspace(0, days, steps), ST_paths[i], lw=0.8, alpha=0.6)
 
     plt.title("Simulated Stock Price Paths")
@@ -48,7 +65,92 @@ def monte_carlo_option_pricing(S, K, days, r, sigma, simulations=100000, steps=1
     plt.grid(True)
     plt.show()
 
-    return call_price, put_price
+# Merge (count, mean, M2) moment triples from two blocks of samples
+def combine_moments(a, b):
+    n_a, mean_a, m2_a = a
+    n_b, mean_b, m2_b = b
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * n_b / n
+    m2 = m2_a + m2_b + delta ** 2 * n_a * n_b / n
+    return n, mean, m2
+
+def block_moments(x):
+    mean = np.mean(x)
+    return len(x), mean, np.sum((x - mean) ** 2)
+
+# Summarise moments as price, standard error and confidence interval
+def moments_summary(moments, confidence=0.95):
+    n, mean, m2 = moments
+    stderr = np.sqrt(m2 / (n - 1) / n) if n > 1 else np.nan
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    return mean, stderr, (mean - z * stderr, mean + z * stderr)
+
+# Streaming European pricer: memory is bounded by chunk_size, not by simulations
+def monte_carlo_option_pricing_streaming(S, K, days, r, sigma, simulations=1_000_000, steps=None,
+                                         chunk_size=100_000, seed=42, confidence=0.95,
+                                         variance_reduction="plain", control_variate=False):
+    """
+    Draws paths in blocks of chunk_size and accumulates payoff moments.
+    With steps=None the GBM terminal value is sampled directly; otherwise each
+    block is stepped through time keeping only the current log-price.
+
+    variance_reduction is one of variance_reduction.METHODS. With 'sobol' every
+    block is an independent scramble and the standard error comes from the
+    spread of the block means. control_variate=True regresses the payoffs on
+    the discounted terminal price, whose expectation is S.
+    """
+    T = days / 360
+    rng = np.random.default_rng(seed)
+    discount = np.exp(-r * T)
+    antithetic = variance_reduction == "antithetic"
+    replicates = variance_reduction == "sobol"
+    call_moments = put_moments = (0, 0.0, 0.0)
+
+    done = 0
+    while done < simulations:
+        n = min(chunk_size, simulations - done)
+        if steps is None:
+            Z = vr.standard_normals(n, 1, variance_reduction, rng)
+            log_ST = (r - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z[:, 0]
+        elif variance_reduction == "plain":
+            dt = T / steps
+            log_ST = np.zeros(n)
+            for _ in range(steps):
+                log_ST += (r - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * rng.standard_normal(n)
+        else:
+            dt = T / steps
+            Z = vr.standard_normals(n, steps, variance_reduction, rng)
+            log_ST = (r - 0.5 * sigma ** 2) * T + sigma * np.sqrt(dt) * Z.sum(axis=1)
+        ST = S * np.exp(log_ST)
+
+        call = discount * np.maximum(ST - K, 0)
+        put = discount * np.maximum(K - ST, 0)
+        if control_variate:
+            call = vr.control_variate(call, discount * ST, S, antithetic)
+            put = vr.control_variate(put, discount * ST, S, antithetic)
+        if antithetic:
+            call, put = vr.pair_average(call), vr.pair_average(put)
+
+        if replicates:
+            call_moments = combine_moments(call_moments, (1, np.mean(call), 0.0))
+            put_moments = combine_moments(put_moments, (1, np.mean(put), 0.0))
+        else:
+            call_moments = combine_moments(call_moments, block_moments(call))
+            put_moments = combine_moments(put_moments, block_moments(put))
+        done += n
+
+    call_price, call_stderr, call_ci = moments_summary(call_moments, confidence)
+    put_price, put_stderr, put_ci = moments_summary(put_moments, confidence)
+    return {
+        "call_price": call_price,
+        "call_stderr": call_stderr,
+        "call_ci": call_ci,
+        "put_price": put_price,
+        "put_stderr": put_stderr,
+        "put_ci": put_ci,
+        "simulations": simulations,
+    }
 
 def main():
     print("Monte Carlo Option Pricing Model with Path Visualization\n")
@@ -59,7 +161,7 @@ def main():
     sigma = float(input("Enter the volatility (sigma) in decimal (e.g. 0.2): "))
     simulations = int(input("Enter number of simulations (e.g. 100000): "))
 
-    monte_carlo_option_pricing(S, K, days, r, sigma, simulations)
+    monte_carlo_option_pricing(S, K, days, r, sigma, simulations, plot=True)
 
 if __name__ == "__main__":
     main()
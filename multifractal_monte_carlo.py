@@ -1,38 +1,129 @@
 import numpy as np
-import matplotlib.pyplot as plt
 
-def generate_multifractal_time(n, H=0.5, lambda2=0.2):
+# =================== CASCADE ===================
+
+def multiplicative_cascade(levels, n_paths, lambda2=0.2, cascade="lognormal", m0=0.6, rng=None):
+    """
+    Masses of the 2**levels cells of a multiplicative cascade on [0, 1] for
+    all paths at once, shape (n_paths, 2**levels), each row summing to 1.
+
+    cascade='lognormal': every split multiplies each half by an independent
+    lognormal weight with mean 1 and log-variance lambda2 * ln 2, so the log
+    mass of a cell of size l has variance lambda2 * ln(1/l).
+    cascade='binomial': each cell passes m0 of its mass to one half (chosen
+    at random) and 1 - m0 to the other; mass is conserved exactly.
+    """
+    rng = np.random if rng is None else rng
+    if cascade not in ("lognormal", "binomial"):
+        raise ValueError(f"Unknown cascade: {cascade!r}")
+
+    # Work with log masses: each level repeats every cell into its two halves and adds their log weights
+    s2 = lambda2 * np.log(2)
+    log_mass = np.zeros((n_paths, 1))
+    for _ in range(levels):
+        n_cells = log_mass.shape[1]
+        if cascade == "lognormal":
+            log_weights = np.sqrt(s2) * rng.standard_normal((n_paths, 2 * n_cells)) - 0.5 * s2
+        else:
+            first = rng.random((n_paths, n_cells)) < 0.5
+            log_weights = np.where(np.stack([first, ~first], axis=-1), np.log(m0), np.log(1 - m0))
+            log_weights = log_weights.reshape(n_paths, 2 * n_cells)
+        log_mass = np.repeat(log_mass, 2, axis=1) + log_weights
+
+    mass = np.exp(log_mass - log_mass.max(axis=1, keepdims=True))
+    return mass / mass.sum(axis=1, keepdims=True)
+
+def multifractal_time(T, steps, n_paths, lambda2=0.2, cascade="lognormal", m0=0.6, rng=None, extra_levels=1):
+    """
+    Trading time theta(t) on the grid t_i = i T / steps, shape
+    (n_paths, steps + 1), with theta(0) = 0 and theta(T) = T. The cascade is
+    built extra_levels finer than the time grid and its cumulative mass is
+    read off (linearly inside a cell) at the grid points.
+    """
+    levels = int(np.ceil(np.log2(max(steps, 1)))) + extra_levels
+    mass = multiplicative_cascade(levels, n_paths, lambda2, cascade, m0, rng)
+    cum = np.concatenate([np.zeros((n_paths, 1)), np.cumsum(mass, axis=1)], axis=1)
+    cum[:, -1] = 1.0
+
+    pos = np.arange(steps + 1) * (mass.shape[1] / steps)
+    cell = np.minimum(pos.astype(int), mass.shape[1] - 1)
+    return T * (cum[:, cell] + (pos - cell) * mass[:, cell])
+
+def generate_multifractal_time(n, H=0.5, lambda2=0.2, rng=None):
     """
-    Generates multifractal trading time using a log-normal cascade
+    Generates multifractal trading time on n points in [0, 1] using a
+    log-normal cascade (H belongs to the fBm and plays no part here)
     """
-    log_vol = np.random.normal(loc=-lambda2 / 2, scale=np.sqrt(lambda2), size=n)
-    weights = np.exp(log_vol)
-    weights /= np.sum(weights)
-    multifractal_time = np.cumsum(weights)
-    multifractal_time /= multifractal_time[-1]  # normalize to [0,1]
-    return multifractal_time
+    return multifractal_time(1.0, n - 1, 1, lambda2, rng=rng)[0]
 
-def simulate_mmar(S0=100, T=1, steps=1000, n_paths=5, H=0.5, lambda2=0.2):
-    dt = T / steps
+# =================== FRACTIONAL BROWNIAN MOTION ===================
+
+def _davies_harte_sqrt_eigenvalues(n, H):
+    k = np.arange(n + 1)
+    gamma = 0.5 * (np.abs(k + 1) ** (2 * H) - 2 * k ** (2 * H) + np.abs(k - 1) ** (2 * H))
+    circulant = np.concatenate([gamma, gamma[-2:0:-1]])
+    eigenvalues = np.fft.fft(circulant).real
+    # The embedding is non-negative definite for fGn; clip round-off below zero
+    return np.sqrt(np.maximum(eigenvalues, 0) / len(circulant))
+
+def fractional_brownian_motion(n_paths, n, H, T=1.0, rng=None):
+    """
+    Fractional Brownian motion B_H with Var B_H(t) = t^(2H) on the uniform
+    grid t_j = j T / n, shape (n_paths, n + 1), by Davies-Harte circulant
+    embedding. Each FFT yields two independent paths (real and imaginary parts).
+    """
+    rng = np.random if rng is None else rng
+    sqrt_eig = _davies_harte_sqrt_eigenvalues(n, H)
+    n_pairs = -(-n_paths // 2)
+    xi = rng.standard_normal((n_pairs, len(sqrt_eig))) + 1j * rng.standard_normal((n_pairs, len(sqrt_eig)))
+    Y = np.fft.fft(sqrt_eig * xi, axis=1)[:, :n]
+    fgn = np.concatenate([Y.real, Y.imag])[:n_paths] * (T / n) ** H
+
+    B = np.zeros((n_paths, n + 1))
+    np.cumsum(fgn, axis=1, out=B[:, 1:])
+    return B
+
+# =================== MMAR ===================
+
+def simulate_mmar(S0=100, T=1, steps=1000, n_paths=5, H=0.5, lambda2=0.2, rng=None, sigma=0.2, mu=0.0,
+                  cascade="lognormal", m0=0.6, chunk_size=10_000, fbm_resolution=2):
+    """
+    Multifractal model of asset returns: ln S(t) = ln S0 + mu t + sigma B_H(theta(t))
+    - 0.5 sigma^2 theta(t)^(2H), with theta the cascade trading time (theta(T) = T)
+    and B_H an independent fBm, so E[S(t) | theta] = S0 e^{mu t} on every date.
+
+    All paths of a chunk are simulated together. For H = 0.5 the increments
+    are drawn exactly as sqrt(d theta) Z; otherwise B_H is simulated on a
+    uniform trading-time grid fbm_resolution times finer than the time grid
+    and interpolated at theta(t).
+    """
+    rng = np.random if rng is None else rng
     time_grid = np.linspace(0, T, steps + 1)
-    all_paths = []
+    paths = np.empty((n_paths, steps + 1))
 
-    for _ in range(n_paths):
-        # Step 1: Generate multifractal time
-        theta = generate_multifractal_time(steps + 1, H=H, lambda2=lambda2)
+    for lo in range(0, n_paths, chunk_size):
+        n = min(chunk_size, n_paths - lo)
+        theta = multifractal_time(T, steps, n, lambda2, cascade, m0, rng)
 
-        # Step 2: Simulate Brownian motion
-        dW = np.random.normal(0, np.sqrt(np.diff(theta)))
-        W = np.concatenate([[0], np.cumsum(dW)])
+        if H == 0.5:
+            X = np.zeros((n, steps + 1))
+            np.cumsum(np.sqrt(np.diff(theta, axis=1)) * rng.standard_normal((n, steps)), axis=1, out=X[:, 1:])
+        else:
+            n_fbm = fbm_resolution * steps
+            B = fractional_brownian_motion(n, n_fbm, H, T, rng)
+            pos = theta * (n_fbm / T)
+            j = np.minimum(pos.astype(int), n_fbm - 1)
+            left = np.take_along_axis(B, j, axis=1)
+            X = left + (pos - j) * (np.take_along_axis(B, j + 1, axis=1) - left)
 
-        # Step 3: Price process
-        log_returns = W  # MMAR: log(S) ~ B(θ(t))
-        S = S0 * np.exp(log_returns - 0.5 * np.var(log_returns))  # adjust for drift
-        all_paths.append(S)
+        paths[lo:lo + n] = S0 * np.exp(mu * time_grid + sigma * X - 0.5 * sigma ** 2 * theta ** (2 * H))
 
-    return time_grid, np.array(all_paths)
+    return time_grid, paths
 
+# matplotlib is only imported here
 def plot_paths(time_grid, paths):
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(10, 6))
     for path in paths:
         plt.plot(time_grid, path, lw=1.5, alpha=0.8)
@@ -50,10 +141,11 @@ def main():
     n_paths = int(input("Number of paths to simulate: "))
     H = float(input("Hurst exponent H (0.5 = Brownian, < 0.5 = anti-persistent): "))
     lambda2 = float(input("Intermittency parameter λ² (e.g. 0.2): "))
+    sigma = float(input("Volatility σ (e.g. 0.2): "))
 
     T = days / 365  # Convert days to years
-    time_grid, paths = simulate_mmar(S0, T, steps, n_paths, H, lambda2)
-    plot_paths(time_grid, paths)
+    time_grid, paths = simulate_mmar(S0, T, steps, n_paths, H, lambda2, sigma=sigma)
+    plot_paths(time_grid, paths[:50])
 
 if __name__ == "__main__":
     main()
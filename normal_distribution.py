@@ -0,0 +1,61 @@
+import math
+import os
+
+import numpy as np
+
+# Standard normal CDF without importing SciPy. Scalars go through math.erfc;
+# arrays use the Cephes ndtr rational approximations (the ones scipy.special
+# wraps), accurate to ~1e-14 absolute but several times slower than the
+# compiled ufunc. Long-running jobs that price large arrays can opt into
+# scipy's ndtr with QUANTFINANCE_NORM_CDF=scipy, paying its ~0.3s import on
+# the first array call; the choice is fixed for the process.
+NORM_CDF_BACKEND = os.environ.get("QUANTFINANCE_NORM_CDF", "numpy")
+if NORM_CDF_BACKEND not in ("numpy", "scipy"):
+    raise ValueError(f"Unknown QUANTFINANCE_NORM_CDF backend: {NORM_CDF_BACKEND!r}")
+
+_P = (2.46196981473530512524e-10, 5.64189564831068821977e-1, 7.46321056442269912687e0, 4.86371970985681366614e1,
+      1.96520832956077098242e2, 5.26445194995477358631e2, 9.34528527171957607540e2, 1.02755188689515710272e3,
+      5.57535335369399327526e2)
+_Q = (1.0, 1.32281951154744992508e1, 8.67072140885989742329e1, 3.54937778887819891062e2, 9.75708501743205489753e2,
+      1.82390916687909736289e3, 2.24633760818710981792e3, 1.65666309194161350182e3, 5.57535340817727675546e2)
+_R = (5.64189583547755073984e-1, 1.27536670759978104416e0, 5.01905042251180477414e0, 6.16021097993053585195e0,
+      7.40974269950448939160e0, 2.97886665372100240670e0)
+_S = (1.0, 2.26052863220117276590e0, 9.39603524938001434673e0, 1.20489539808096656605e1, 1.70814450747565897222e1,
+      9.60896809063285878198e0, 3.36907645100081516050e0)
+_T = (9.60497373987051638749e0, 9.00260197203842689217e1, 2.23200534594684319226e3, 7.00332514112805075473e3,
+      5.55923013010394962768e4)
+_U = (1.0, 3.35617141647503099647e1, 5.21357949780152679795e2, 4.59432382970980127987e3, 2.26290000613890934246e4,
+      4.92673942608635921086e4)
+
+def _polevl(x, coefs):
+    y = np.full_like(x, coefs[0])
+    for c in coefs[1:]:
+        y *= x
+        y += c
+    return y
+
+def _ndtr_numpy(a):
+    x = a * math.sqrt(0.5)
+    z = np.abs(x)
+    small = z < math.sqrt(0.5)
+
+    # |a| < 1: 0.5 + 0.5 erf(x)
+    xs = np.where(small, x, 0.0)
+    xx = xs * xs
+    central = 0.5 + 0.5 * xs * _polevl(xx, _T) / _polevl(xx, _U)
+
+    # Tails: 0.5 erfc(|x|), reflected for positive arguments; erfc underflows
+    # long before |x| = 40, which also keeps the polynomials finite for inf
+    zl = np.where(small, 1.0, np.minimum(z, 40.0))
+    ratio = np.where(zl < 8.0, _polevl(zl, _P) / _polevl(zl, _Q), _polevl(zl, _R) / _polevl(zl, _S))
+    tail = 0.5 * np.exp(-zl * zl) * ratio
+    return np.where(small, central, np.where(x > 0, 1.0 - tail, tail))
+
+def norm_cdf(x):
+    if np.ndim(x) == 0:
+        return 0.5 * math.erfc(-float(x) * math.sqrt(0.5))
+    x = np.asarray(x, dtype=float)
+    if NORM_CDF_BACKEND == "scipy":
+        from scipy.special import ndtr
+        return ndtr(x)
+    return _ndtr_numpy(x)
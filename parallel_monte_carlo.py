@@ -0,0 +1,129 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import kernels
+from exotic_option_pricing import generate_price_paths
+from monte_carlo import block_moments, combine_moments, moments_summary
+from multifractal_monte_carlo import simulate_mmar
+from stochastic_vol_model import heston_simulation
+
+# =================== EXECUTOR ===================
+
+def run_parallel(shard_fn, params, n_paths, seed=42, n_workers=None, shard_size=50_000):
+    """
+    Splits n_paths into fixed-size shards, runs shard_fn(params, n, seed_seq)
+    for each on a process pool and reduces the returned payoff moments.
+
+    Every shard gets its own SeedSequence spawned from seed, and shards are
+    reduced in shard order, so results are bit-identical for a given seed
+    and shard_size whatever the number of workers.
+    """
+    if n_paths <= 0:
+        raise ValueError(f"n_paths must be positive, got {n_paths}")
+    n_shards = -(-n_paths // shard_size)
+    sizes = [shard_size] * (n_shards - 1) + [n_paths - shard_size * (n_shards - 1)]
+    seeds = np.random.SeedSequence(seed).spawn(n_shards)
+
+    n_workers = n_workers or os.cpu_count()
+    if n_workers == 1:
+        results = [shard_fn(params, n, s) for n, s in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            results = list(pool.map(shard_fn, [params] * n_shards, sizes, seeds))
+
+    return reduce_moments(results)
+
+def reduce_moments(results):
+    totals = {}
+    for shard in results:
+        for name, moments in shard.items():
+            totals[name] = combine_moments(totals.get(name, (0, 0.0, 0.0)), moments)
+    return totals
+
+def summarize(totals, confidence=0.95):
+    summary = {}
+    for name, moments in totals.items():
+        price, stderr, ci = moments_summary(moments, confidence)
+        summary[name] = {"price": price, "stderr": stderr, "ci": ci}
+    return summary
+
+# =================== SHARDS ===================
+# Module-level functions so they can be pickled to worker processes.
+# Each returns {payoff name: (count, mean, M2)}.
+
+def european_gbm_shard(params, n_paths, seed_seq):
+    rng = np.random.default_rng(seed_seq)
+    S, K, r, sigma, T = params["S"], params["K"], params["r"], params["sigma"], params["T"]
+    ST = S * np.exp((r - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * rng.standard_normal(n_paths))
+    discount = np.exp(-r * T)
+    return {
+        "call": block_moments(discount * np.maximum(ST - K, 0)),
+        "put": block_moments(discount * np.maximum(K - ST, 0)),
+    }
+
+def exotic_gbm_shard(params, n_paths, seed_seq):
+    rng = np.random.default_rng(seed_seq)
+    S0, K, B, r, sigma, T = (params[k] for k in ("S0", "K", "B", "r", "sigma", "T"))
+    paths = generate_price_paths(S0, r, sigma, T, params["steps"], n_paths, rng=rng)
+    discount = np.exp(-r * T)
+    average, low, high = kernels.path_statistics(paths)
+    return {
+        "asian_call": block_moments(discount * np.maximum(average - K, 0)),
+        "barrier_call": block_moments(discount * np.where(high >= B, 0, np.maximum(paths[:, -1] - K, 0))),
+        "lookback_call": block_moments(discount * (paths[:, -1] - low)),
+    }
+
+def heston_shard(params, n_paths, seed_seq):
+    rng = np.random.default_rng(seed_seq)
+    S, _ = heston_simulation(params["S0"], params["v0"], params["r"], params["kappa"], params["theta"],
+                             params["sigma"], params["rho"], params["T"], params["steps"], n_paths, rng=rng)
+    discount = np.exp(-params["r"] * params["T"])
+    return {"call": block_moments(discount * np.maximum(S[:, -1] - params["K"], 0))}
+
+def mmar_shard(params, n_paths, seed_seq):
+    rng = np.random.default_rng(seed_seq)
+    _, paths = simulate_mmar(params["S0"], params["T"], params["steps"], n_paths, params["H"], params["lambda2"], rng=rng)
+    return {
+        "terminal_price": block_moments(paths[:, -1]),
+        "log_return": block_moments(np.log(paths[:, -1] / params["S0"])),
+    }
+
+# =================== CONVENIENCE WRAPPERS ===================
+
+def price_european_parallel(S, K, days, r, sigma, n_paths=10_000_000, seed=42, n_workers=None, shard_size=500_000):
+    params = {"S": S, "K": K, "r": r, "sigma": sigma, "T": days / 360}
+    return summarize(run_parallel(european_gbm_shard, params, n_paths, seed, n_workers, shard_size))
+
+def price_exotics_parallel(S0, K, B, days, r, sigma, steps, n_paths, seed=42, n_workers=None, shard_size=20_000):
+    params = {"S0": S0, "K": K, "B": B, "r": r, "sigma": sigma, "T": days / 365, "steps": steps}
+    return summarize(run_parallel(exotic_gbm_shard, params, n_paths, seed, n_workers, shard_size))
+
+def price_heston_parallel(S0, K, days, r, v0, kappa, theta, sigma, rho, steps, n_paths, seed=42, n_workers=None,
+                          shard_size=20_000):
+    params = {"S0": S0, "K": K, "r": r, "v0": v0, "kappa": kappa, "theta": theta, "sigma": sigma, "rho": rho,
+              "T": days / 365, "steps": steps}
+    return summarize(run_parallel(heston_shard, params, n_paths, seed, n_workers, shard_size))
+
+def simulate_mmar_parallel(S0, days, steps, n_paths, H=0.5, lambda2=0.2, seed=42, n_workers=None, shard_size=10_000):
+    params = {"S0": S0, "T": days / 365, "steps": steps, "H": H, "lambda2": lambda2}
+    return summarize(run_parallel(mmar_shard, params, n_paths, seed, n_workers, shard_size))
+
+def main():
+    print("Parallel Monte Carlo (reproducible per-shard RNG streams)\n")
+    S = float(input("Enter the current stock price (S): "))
+    K = float(input("Enter the strike price (K): "))
+    days = int(input("Enter days to expiration: "))
+    r = float(input("Enter the risk-free interest rate (r) in decimal (e.g. 0.05): "))
+    sigma = float(input("Enter the volatility (sigma) in decimal (e.g. 0.2): "))
+    n_paths = int(input("Enter number of simulations (e.g. 10000000): "))
+    n_workers = int(input(f"Enter number of worker processes (1-{os.cpu_count()}): "))
+
+    result = price_european_parallel(S, K, days, r, sigma, n_paths, n_workers=n_workers)
+    for name, label in (("call", "📈 Call"), ("put", "📉 Put")):
+        low, high = result[name]["ci"]
+        print(f"{label} Option Price: {result[name]['price']:.4f} ± {result[name]['stderr']:.4f} (95% CI {low:.4f} – {high:.4f})")
+
+if __name__ == "__main__":
+    main()
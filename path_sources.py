@@ -0,0 +1,164 @@
+import numpy as np
+
+from exotic_option_pricing import (generate_price_paths, instrument_moments, price_asian_call, price_barrier_call,
+                                   price_lookback_call)
+from monte_carlo import combine_moments, moments_summary
+from multifractal_monte_carlo import simulate_mmar
+from stochastic_vol_model import heston_log_simulation, price_european_call_mc
+
+# =================== PATH SOURCES ===================
+# A path source simulates risk-neutral price paths on a fixed grid:
+#   source.simulate(n_paths, rng) -> (n_paths, steps + 1) array starting at S0
+# and exposes S0, r, T, steps and reference_vol (the volatility used by
+# barrier monitoring corrections).
+
+class GBMSource:
+    def __init__(self, S0, r, sigma, T, steps, method="plain"):
+        self.S0, self.r, self.sigma, self.T, self.steps = S0, r, sigma, T, steps
+        self.method = method
+        self.reference_vol = sigma
+
+    def simulate(self, n_paths, rng):
+        return generate_price_paths(self.S0, self.r, self.sigma, self.T, self.steps, n_paths, self.method, rng)
+
+class HestonSource:
+    def __init__(self, S0, r, v0, kappa, theta, sigma, rho, T, steps, scheme="qe"):
+        self.S0, self.r, self.T, self.steps = S0, r, T, steps
+        self.v0, self.kappa, self.theta, self.sigma, self.rho = v0, kappa, theta, sigma, rho
+        self.scheme = scheme
+        self.reference_vol = np.sqrt(v0)
+
+    def simulate(self, n_paths, rng):
+        x, _ = heston_log_simulation(self.S0, self.v0, self.r, self.kappa, self.theta, self.sigma, self.rho, self.T,
+                                     self.steps, n_paths, store="full", scheme=self.scheme, rng=rng)
+        return np.exp(x)
+
+class MMARSource:
+    """
+    Multifractal paths with drift r. martingale='conditional' keeps the
+    simulator's analytic correction (E[S_t | theta] = S0 e^{rt}, an exact
+    martingale for H = 0.5); 'empirical' additionally applies the empirical
+    martingale correction, so the discounted sample mean equals S0 on every
+    date of every chunk, which removes the drift bias left by H != 0.5 at
+    the cost of coupling the paths within a chunk (see price_streaming).
+    """
+
+    def __init__(self, S0, r, sigma, T, steps, H=0.5, lambda2=0.2, cascade="lognormal", martingale="conditional"):
+        if martingale not in ("conditional", "empirical"):
+            raise ValueError(f"Unknown martingale correction: {martingale!r}")
+        self.S0, self.r, self.sigma, self.T, self.steps = S0, r, sigma, T, steps
+        self.H, self.lambda2, self.cascade = H, lambda2, cascade
+        self.martingale = martingale
+        self.reference_vol = sigma
+
+    def simulate(self, n_paths, rng):
+        time_grid, paths = simulate_mmar(self.S0, self.T, self.steps, n_paths, self.H, self.lambda2, rng=rng,
+                                         sigma=self.sigma, mu=self.r, cascade=self.cascade, chunk_size=n_paths)
+        if self.martingale == "empirical":
+            paths = empirical_martingale_correction(paths, self.r, time_grid)
+        return paths
+
+# Duan-Simonato empirical martingale simulation: rebuilds the paths date by
+# date from their gross returns so that mean(e^{-r t} S_t) = S0 exactly
+def empirical_martingale_correction(paths, r, time_grid):
+    corrected = np.empty_like(paths)
+    corrected[:, 0] = paths[:, 0]
+    S0 = paths[0, 0]
+    for i in range(1, paths.shape[1]):
+        Z = corrected[:, i - 1] * (paths[:, i] / paths[:, i - 1])
+        corrected[:, i] = S0 * np.exp(r * time_grid[i]) * Z / np.mean(Z)
+    return corrected
+
+# =================== STREAMING PRICER ===================
+
+def payoff(price_fn, *args, **kwargs):
+    """
+    Wraps one of the existing path pricers (price_asian_call,
+    price_european_call_mc, ...) as paths -> (count, mean, M2), the chunk
+    moments of its estimator samples. With antithetic=True the samples are
+    the n/2 pair averages; with control_variate=True they are the controlled
+    payoffs, whose M2 is what the pricer's stderr is built from.
+    """
+    def chunk_moments(paths):
+        price, stderr = price_fn(paths, *args, return_stderr=True, **kwargs)
+        # The pricer's (mean, stderr) over m samples pins down their squared deviations
+        m = len(paths) // 2 if kwargs.get("antithetic") else len(paths)
+        return m, price, stderr ** 2 * m * (m - 1)
+    return chunk_moments
+
+def price_streaming(source, n_paths, payoffs=None, accumulators=(), chunk_size=20_000, seed=42, confidence=0.95):
+    """
+    Prices against any path source chunk by chunk, with memory
+    O(chunk_size x steps). payoffs maps names to paths -> (count, mean, M2)
+    callables (see payoff); accumulators are the step-wise instrument sets of
+    exotic_option_pricing. Chunk estimates are merged exactly through their
+    moments. Returns {name: {'price', 'stderr', 'ci'}} (arrays for
+    accumulators). stderr and ci assume i.i.d. paths; they are only
+    approximate for sources that couple paths within a chunk, such as
+    MMARSource(martingale='empirical'), whose prices also depend on
+    chunk_size.
+    """
+    payoffs = payoffs or {}
+    rng = np.random.default_rng(seed)
+    dt = source.T / source.steps
+    discount = np.exp(-source.r * source.T)
+    moments = instrument_moments(list(payoffs) + [acc.name for acc in accumulators])
+
+    done = 0
+    while done < n_paths:
+        n = min(chunk_size, n_paths - done)
+        paths = source.simulate(n, rng)
+
+        for name, chunk_moments in payoffs.items():
+            moments[name] = combine_moments(moments[name], chunk_moments(paths))
+
+        if accumulators:
+            for acc in accumulators:
+                acc.start(paths[:, 0], dt, source.reference_vol)
+            for i in range(1, paths.shape[1]):
+                for acc in accumulators:
+                    acc.update(paths[:, i - 1], paths[:, i])
+            for acc in accumulators:
+                samples = discount * acc.payoffs(paths[:, -1])
+                mean = samples.mean(axis=0)
+                moments[acc.name] = combine_moments(moments[acc.name], (n, mean, np.sum((samples - mean) ** 2, axis=0)))
+        done += n
+
+    results = {}
+    for name, m in moments.items():
+        price, stderr, ci = moments_summary(m, confidence)
+        results[name] = {"price": price, "stderr": stderr, "ci": ci}
+    return results
+
+def main():
+    print("Exotic prices across path models (GBM / Heston / MMAR)\n")
+    S0 = float(input("Initial stock price (S0): "))
+    K = float(input("Strike price (K): "))
+    B = float(input("Barrier level (for knock-out call): "))
+    days = int(input("Days to expiration: "))
+    r = float(input("Risk-free rate (e.g. 0.05): "))
+    sigma = float(input("Volatility (sigma, e.g. 0.2): "))
+    n_paths = int(input("Number of simulation paths (e.g. 200000): "))
+
+    T = days / 365
+    steps = max(days, 1)
+    sources = {
+        "GBM": GBMSource(S0, r, sigma, T, steps),
+        "Heston": HestonSource(S0, r, sigma ** 2, 2.0, sigma ** 2, 0.5, -0.7, T, steps),
+        "MMAR": MMARSource(S0, r, sigma, T, steps, H=0.5, lambda2=0.2),
+    }
+    payoffs = {
+        "European call": payoff(price_european_call_mc, K, r, T),
+        "Asian call": payoff(price_asian_call, K, r, T),
+        "Up-and-out call": payoff(price_barrier_call, K, B, r, T),
+        "Lookback call": payoff(price_lookback_call, r, T),
+    }
+
+    print(f"\n{'':<18}" + "".join(f"{name:>22}" for name in sources))
+    results = {model: price_streaming(source, n_paths, payoffs) for model, source in sources.items()}
+    for name in payoffs:
+        row = "".join(f"{results[m][name]['price']:>13.4f} ± {results[m][name]['stderr']:<6.4f}" for m in sources)
+        print(f"{name:<18}{row}")
+
+if __name__ == "__main__":
+    main()
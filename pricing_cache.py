@@ -0,0 +1,178 @@
+import functools
+import inspect
+import numbers
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from black_sholes import black_scholes
+from interest_rate_derivative_pricing import price_cap_floor
+from stochastic_vol_model import sabr_implied_vol
+from vol_surface import implied_volatility_call
+
+# =================== CACHE ===================
+
+class PricingCache:
+    """
+    Bounded LRU memo for pricing calls, keyed on the function and its
+    normalized arguments, with an optional time-to-live in seconds.
+
+    Every cached function depends on named market-data sources ('rates',
+    'vols', ...). Each entry remembers the source versions it was priced
+    under; set_version / bump move a source to a new version, after which
+    entries that depend on it miss and are repriced, while everything else
+    keeps being served from the cache.
+    """
+
+    def __init__(self, maxsize=10_000, ttl=None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._epoch = 0
+        self._lock = threading.RLock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = self.misses = self.expired = self.stale = self.evictions = 0
+
+    def stats(self):
+        calls = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "stale": self.stale,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "hit_rate": self.hits / calls if calls else 0.0,
+        }
+
+    # --- Market-data versions
+    def version(self, source):
+        return self._versions.get(source, 0)
+
+    def set_version(self, source, version):
+        """Declares the current version (any hashable, e.g. a snapshot id) of a market-data source."""
+        with self._lock:
+            self._versions[source] = version
+
+    def bump(self, *sources):
+        """Moves the given sources to a new version; with no sources every entry goes stale."""
+        with self._lock:
+            if not sources:
+                self._epoch += 1
+            for source in sources:
+                version = self._versions.get(source, 0)
+                self._versions[source] = version + 1 if isinstance(version, int) else (version, 1)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    # --- Lookups
+    def get_or_compute(self, key, sources, compute):
+        versions = (self._epoch,) + tuple(self._versions.get(source, 0) for source in sources)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, entry_versions = entry
+                if entry_versions != versions:
+                    self.stale += 1
+                elif expires_at is not None and self.clock() >= expires_at:
+                    self.expired += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+
+        value = _freeze(compute())
+        expires_at = None if self.ttl is None else self.clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at, versions)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def cached(self, fn=None, sources=("market",)):
+        """
+        Decorator memoizing fn in this cache. Positional and keyword calls
+        share entries (defaults are filled in before keying), and ints,
+        floats and NumPy scalars of equal value are the same key. Hits do not
+        run fn, so anything it reports only appears on misses. Cached arrays
+        are returned read-only, since every caller shares them.
+        """
+        if fn is None:
+            return functools.partial(self.cached, sources=sources)
+        name = f"{fn.__module__}.{fn.__qualname__}"
+        sources = tuple(sources)
+        # Keys are built positionally over the full parameter list, which is
+        # much cheaper than inspect's bind on the hit path
+        params = list(inspect.signature(fn).parameters.values())
+        if any(p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD) for p in params):
+            raise TypeError(f"Cannot cache {name}: *args / **kwargs parameters have no stable key")
+        names = [p.name for p in params]
+        defaults = {p.name: p.default for p in params}
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            values = list(args)
+            if kwargs or len(values) < len(names):
+                rest = dict(kwargs)
+                values += [rest.pop(arg, defaults[arg]) for arg in names[len(values):]]
+                if rest or any(value is inspect.Parameter.empty for value in values):
+                    return fn(*args, **kwargs)  # let fn raise its own TypeError
+            key = (name,) + tuple(_normalize(value) for value in values)
+            return self.get_or_compute(key, sources, lambda: fn(*args, **kwargs))
+
+        wrapper.cache = self
+        return wrapper
+
+# Hashable, value-based form of an argument
+def _normalize(value):
+    if type(value) is float:
+        return value
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, numbers.Integral):
+        return float(value) if abs(value) < 2 ** 53 else int(value)
+    if isinstance(value, numbers.Real):
+        return float(value)
+    if isinstance(value, np.ndarray):
+        if value.ndim == 0:
+            return _normalize(value.item())
+        value = np.ascontiguousarray(value)
+        return ("ndarray", value.dtype.str, value.shape, value.tobytes())
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__,) + tuple(_normalize(item) for item in value)
+    if isinstance(value, dict):
+        return ("dict",) + tuple(sorted((key, _normalize(item)) for key, item in value.items()))
+    hash(value)
+    return value
+
+def _freeze(value):
+    if isinstance(value, np.ndarray):
+        value = value.copy()
+        value.flags.writeable = False
+    elif isinstance(value, tuple):
+        value = tuple(_freeze(item) for item in value)
+    return value
+
+# =================== SHARED CACHE ===================
+# One process-wide cache for the pricing entry points the risk UI polls.
+# Tick a source with default_cache.bump('rates') or
+# default_cache.set_version('vols', snapshot_id) when its market data changes.
+
+default_cache = PricingCache(maxsize=50_000, ttl=300.0)
+
+cached_black_scholes = default_cache.cached(black_scholes, sources=("equity", "rates", "vols"))
+cached_implied_volatility_call = default_cache.cached(implied_volatility_call, sources=("equity", "rates"))
+cached_sabr_implied_vol = default_cache.cached(sabr_implied_vol, sources=("vols",))
+cached_price_cap_floor = default_cache.cached(price_cap_floor, sources=("rates", "vols"))
@@ -1,65 +1,109 @@
 import numpy as np
-from scipy.stats import norm
-import matplotlib.pyplot as plt
+
+import kernels
+from normal_distribution import norm_cdf
+from verbosity import report
 
 # === Black-Scholes Call Pricing & Delta ===
+# Works on scalars or arrays; at expiry (T <= 0) returns the payoff and a 0/1 delta
 def black_scholes_call(S, K, T, r, sigma):
-    d1 = (np.log(S/K) + (r + 0.5*sigma**2)*T) / (sigma*np.sqrt(T))
-    d2 = d1 - sigma*np.sqrt(T)
-    price = S * norm.cdf(d1) - K * np.exp(-r*T) * norm.cdf(d2)
-    delta = norm.cdf(d1)
-    return price, delta
+    S, T = np.asarray(S, dtype=float), np.asarray(T, dtype=float)
+    expired = T <= 0
+    T_live = np.where(expired, 1.0, T)
+    d1 = (np.log(S/K) + (r + 0.5*sigma**2)*T_live) / (sigma*np.sqrt(T_live))
+    d2 = d1 - sigma*np.sqrt(T_live)
+    price = np.where(expired, np.maximum(S - K, 0), S * norm_cdf(d1) - K * np.exp(-r*T_live) * norm_cdf(d2))
+    delta = np.where(expired, (S > K).astype(float), norm_cdf(d1))
+    return price[()], delta[()]
 
 # === Delta Hedging Simulator ===
-def delta_hedging_simulation(S0, K, T_days, r, sigma, dt_days, n_steps):
+def delta_hedging_simulation(S0, K, T_days, r, sigma, dt_days, n_steps=None):
     T = T_days / 365
-    dt = dt_days / 365
-    steps = int(T / dt)
-
-    # Initialize arrays
-    stock_prices = [S0]
-    option_prices = []
-    deltas = []
-    hedge_positions = []
-    cash_positions = []
-
-    S = S0
-    option_price, delta = black_scholes_call(S, K, T, r, sigma)
-    option_prices.append(option_price)
-    deltas.append(delta)
-
-    hedge = -delta
-    hedge_positions.append(hedge)
-    cash = option_price + hedge * S
-    cash_positions.append(cash)
-
-    for i in range(1, steps + 1):
-        # Simulate next stock price (random walk)
-        dW = np.random.normal(0, np.sqrt(dt))
-        S = S * np.exp((r - 0.5 * sigma**2) * dt + sigma * dW)
-        stock_prices.append(S)
-
-        T_left = T - i * dt
-        option_price, delta = black_scholes_call(S, K, T_left, r, sigma)
-        option_prices.append(option_price)
-        deltas.append(delta)
-
-        hedge = -delta
-        hedge_positions.append(hedge)
-
-        cash = cash_positions[-1] * np.exp(r * dt) + (hedge_positions[-2] - hedge) * S
-        cash_positions.append(cash)
+    if n_steps:
+        # An explicit step count wins over dt_days
+        steps = n_steps
+        dt = T / steps
+    else:
+        dt = dt_days / 365
+        steps = int(T / dt)
+
+    # Simulate the whole stock path (random walk), then price and hedge every date at once
+    dW = np.random.normal(0, np.sqrt(dt), steps)
+    stock_prices = kernels.gbm_paths(S0, (r - 0.5 * sigma**2) * dt, sigma, dW[None, :])[0]
+
+    T_left = T - np.arange(steps + 1) * dt
+    option_prices, deltas = black_scholes_call(stock_prices, K, T_left, r, sigma)
+
+    hedge_positions = -deltas
+    cash_positions = kernels.hedge_cash(option_prices[0] + hedge_positions[0] * S0, hedge_positions,
+                                        stock_prices, np.full(steps, np.exp(r * dt)))[0]
 
     # Final PnL
-    final_value = hedge * S + cash + option_prices[-1]
+    final_value = hedge_positions[-1] * stock_prices[-1] + cash_positions[-1] + option_prices[-1]
     pnl = final_value - option_prices[0]
 
-    print(f"\n📉 Final PnL of Hedged Portfolio: {pnl:.4f}")
+    report(f"\n📉 Final PnL of Hedged Portfolio: {pnl:.4f}")
+
+    return stock_prices.tolist(), option_prices.tolist(), deltas.tolist(), cash_positions.tolist()
+
+# === Vectorized Cross-Path Delta Hedging ===
+def delta_hedging_batch(S0, K, T_days, r, sigma, dt_days=1, n_paths=100_000, mu=None, hedge_sigma=None, rng=None):
+    """
+    Sells one call per path and delta-hedges it on every rebalancing date,
+    all paths at once. Stock follows GBM with drift mu (default r) and
+    volatility sigma; deltas use hedge_sigma (default sigma). Cash accrues at r.
+    Memory is O(n_paths): only the current state of every path is kept.
+    Returns (pnl per path, summary statistics).
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    mu = r if mu is None else mu
+    hedge_sigma = sigma if hedge_sigma is None else hedge_sigma
+    T = T_days / 365
 
-    return stock_prices, option_prices, deltas, cash_positions
+    # Rebalancing dates in years; the last period is shorter if dt_days does not divide T_days
+    times = np.append(np.arange(0, T_days, dt_days), T_days) / 365
+
+    S = np.full(n_paths, float(S0))
+    premium, delta = black_scholes_call(S, K, T, r, hedge_sigma)
+    cash = premium - delta * S
+
+    for t_prev, t in zip(times[:-1], times[1:]):
+        dt = t - t_prev
+        S = S * np.exp((mu - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * rng.standard_normal(n_paths))
+        cash *= np.exp(r * dt)
+        if t < T:
+            # Only the delta is needed between inception and expiry
+            tau = T - t
+            new_delta = norm_cdf((np.log(S / K) + (r + 0.5 * hedge_sigma ** 2) * tau) / (hedge_sigma * np.sqrt(tau)))
+            cash -= (new_delta - delta) * S
+            delta = new_delta
+
+    # Unwind the stock and settle the call at expiry
+    pnl = cash + delta * S - np.maximum(S - K, 0)
+    return pnl, pnl_summary(pnl, premium[0])
+
+def pnl_summary(pnl, premium):
+    q01, q05, q50, q95, q99 = np.percentile(pnl, [1, 5, 50, 95, 99])
+    tail = pnl[pnl <= q05]
+    return {
+        "paths": len(pnl),
+        "premium": premium,
+        "mean": np.mean(pnl),
+        "std": np.std(pnl, ddof=1),
+        "std_over_premium": np.std(pnl, ddof=1) / premium,
+        "q01": q01,
+        "q05": q05,
+        "median": q50,
+        "q95": q95,
+        "q99": q99,
+        "es05": np.mean(tail),
+    }
 
 # === Visualization ===
+# matplotlib is only imported here
 def plot_results(stock_prices, deltas, cash_positions):
+    import matplotlib.pyplot as plt
+
     time = np.arange(len(stock_prices))
     fig, ax = plt.subplots(3, 1, figsize=(10, 10), sharex=True)
 
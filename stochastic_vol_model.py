@@ -1,52 +1,378 @@
 import numpy as np
 
+import kernels
+import variance_reduction as vr
+from instrumentation import phase
+
 # =================== HESTON MODEL ===================
 
-def heston_simulation(S0, v0, r, kappa, theta, sigma, rho, T, steps, n_paths):
+def heston_simulation(S0, v0, r, kappa, theta, sigma, rho, T, steps, n_paths, method="plain", rng=None):
+    dt = T / steps
+
+    with phase("heston_simulation.rng") as p:
+        if method == "plain" and rng is None:
+            # Legacy global-state draws, in the original step-by-step order
+            Z = np.empty((2, steps, n_paths))
+            for t in range(steps):
+                Z[0, t] = np.random.standard_normal(n_paths)
+                Z[1, t] = np.random.standard_normal(n_paths)
+            Z = Z.transpose(0, 2, 1)
+        else:
+            Z = vr.standard_normals(n_paths, steps, method, rng, factors=2)
+        p.add(draws=Z.size, bytes=Z.nbytes)
+
+    with phase("heston_simulation.stepping", path_steps=n_paths * steps) as p:
+        S, v = kernels.heston_euler_paths(S0, v0, r, kappa, theta, sigma, rho, dt, Z[0], Z[1])
+        p.add(bytes=S.nbytes + v.nbytes)
+    return S, v
+
+def price_european_call_mc(S, K, r, T, return_stderr=False, antithetic=False, control_variate=False, greeks=False,
+                           gamma_bump=0.01):
+    """
+    With greeks=True returns a dict with price, delta and gamma and their
+    standard errors; control_variate applies to the price. Heston paths
+    scale linearly in S0, so delta is pathwise and gamma is a central
+    difference on the same paths rescaled by 1 +/- gamma_bump (common random
+    numbers, no resimulation). Vega needs a resimulation: see
+    heston_greeks_mc.
+    """
+    discount = np.exp(-r * T)
+    payoff = discount * np.maximum(S[:, -1] - K, 0)
+    # The discounted terminal price is a martingale with known mean S0
+    controlled = vr.control_variate(payoff, discount * S[:, -1], S[0, 0], antithetic) if control_variate else payoff
+    if greeks:
+        S0 = S[:, 0]
+        h = gamma_bump * S0
+        up = discount * np.maximum(S[:, -1] * (1 + gamma_bump) - K, 0)
+        down = discount * np.maximum(S[:, -1] * (1 - gamma_bump) - K, 0)
+        return greek_estimates({
+            "price": controlled,
+            "delta": discount * (S[:, -1] > K) * S[:, -1] / S0,
+            "gamma": (up - 2 * payoff + down) / h ** 2,
+        }, antithetic)
+    price, stderr = vr.mc_estimate(controlled, antithetic)
+    return (price, stderr) if return_stderr else price
+
+# Per-path estimator samples -> {name: estimate, name_stderr: standard error}
+def greek_estimates(samples, antithetic=False):
+    out = {}
+    for name, values in samples.items():
+        out[name], out[f"{name}_stderr"] = vr.mc_estimate(values, antithetic)
+    return out
+
+def heston_greeks_mc(S0, K, v0, r, kappa, theta, sigma, rho, T, steps, n_paths, seed=42, vol_bump=0.01):
+    """
+    Price, delta, gamma and vega of a European call under Heston from one
+    base simulation plus two bumped ones sharing its random numbers. Vega is
+    the sensitivity to the initial volatility sqrt(v0), by central difference.
+    """
+    def simulate(v_start):
+        return heston_simulation(S0, v_start, r, kappa, theta, sigma, rho, T, steps, n_paths,
+                                 rng=np.random.default_rng(seed))
+
+    S, _ = simulate(v0)
+    out = price_european_call_mc(S, K, r, T, greeks=True)
+
+    vol0 = np.sqrt(v0)
+    discount = np.exp(-r * T)
+    S_up, _ = simulate((vol0 + vol_bump) ** 2)
+    S_down, _ = simulate(max(vol0 - vol_bump, 0.0) ** 2)
+    vega = discount * (np.maximum(S_up[:, -1] - K, 0) - np.maximum(S_down[:, -1] - K, 0)) / (vol0 + vol_bump - max(vol0 - vol_bump, 0.0))
+    out["vega"], out["vega_stderr"] = vr.mc_estimate(vega)
+    return out
+
+
+# Memory-lean Heston simulator on log-spot with preallocated, in-place state
+def heston_log_simulation(S0, v0, r, kappa, theta, sigma, rho, T, steps, n_paths, store="terminal",
+                          obs_steps=None, scheme="qe", rng=None, q=0.0):
+    """
+    Simulates x = ln S and v keeping only the current state in reusable buffers.
+
+    store: 'terminal' returns (x_T, v_T) as (n_paths,) arrays, 'dates' returns
+    (n_paths, len(obs_steps)) arrays at the given step indices, 'full' returns
+    (n_paths, steps + 1) arrays like heston_simulation.
+    scheme: 'qe' (Andersen quadratic-exponential variance with the central
+    log-spot discretisation) or 'full_truncation' Euler.
+    """
+    if store not in ("terminal", "dates", "full"):
+        raise ValueError(f"Unknown store mode: {store!r}")
+    if scheme not in ("qe", "full_truncation"):
+        raise ValueError(f"Unknown scheme: {scheme!r}")
+    rng = np.random.default_rng() if rng is None else rng
     dt = T / steps
-    S = np.zeros((n_paths, steps + 1))
-    v = np.zeros((n_paths, steps + 1))
 
-    S[:, 0] = S0
-    v[:, 0] = v0
+    if store == "full":
+        obs_steps = range(steps + 1)
+    elif store == "terminal":
+        obs_steps = [steps]
+    obs_column = {step: j for j, step in enumerate(obs_steps)}
+    x_out = np.empty((n_paths, len(obs_column)))
+    v_out = np.empty((n_paths, len(obs_column)))
 
+    x = np.full(n_paths, np.log(S0))
+    v = np.full(n_paths, float(v0))
+    Z = np.empty(n_paths)
+    U = np.empty(n_paths)
+    buffers = [np.empty(n_paths) for _ in range(5)]
+
+    if 0 in obs_column:
+        x_out[:, obs_column[0]] = x
+        v_out[:, obs_column[0]] = v
+
+    step_fn = _heston_qe_step if scheme == "qe" else _heston_full_truncation_step
     for t in range(1, steps + 1):
-        Z1 = np.random.standard_normal(n_paths)
-        Z2 = rho * Z1 + np.sqrt(1 - rho ** 2) * np.random.standard_normal(n_paths)
+        rng.standard_normal(out=Z)
+        rng.random(out=U)
+        step_fn(x, v, Z, U, buffers, r - q, kappa, theta, sigma, rho, dt)
+        if t in obs_column:
+            x_out[:, obs_column[t]] = x
+            v_out[:, obs_column[t]] = v
 
-        v[:, t] = np.maximum(v[:, t - 1] + kappa * (theta - v[:, t - 1]) * dt + sigma * np.sqrt(v[:, t - 1]) * np.sqrt(dt) * Z2, 0)
-        S[:, t] = S[:, t - 1] * np.exp((r - 0.5 * v[:, t - 1]) * dt + np.sqrt(v[:, t - 1]) * np.sqrt(dt) * Z1)
+    if store == "terminal":
+        return x_out[:, 0], v_out[:, 0]
+    return x_out, v_out
 
-    return S, v
+# Step functions import ndtri on call: scipy.special is only needed once a simulation runs
+def _heston_full_truncation_step(x, v, Z, U, buffers, mu, kappa, theta, sigma, rho, dt):
+    from scipy.special import ndtri
+
+    v_pos, sqrt_vdt, Zv = buffers[:3]
+    np.maximum(v, 0, out=v_pos)
+    np.multiply(v_pos, dt, out=sqrt_vdt)
+    np.sqrt(sqrt_vdt, out=sqrt_vdt)
+
+    # Second normal from the uniform draw, correlated with Z
+    ndtri(U, out=Zv)
+    Zv *= np.sqrt(1 - rho ** 2)
+    Zv += rho * Z
+
+    # x += (mu - v+/2) dt + sqrt(v+ dt) Z
+    x += mu * dt
+    x -= 0.5 * dt * v_pos
+    x += sqrt_vdt * Z
+
+    # v += kappa (theta - v+) dt + sigma sqrt(v+ dt) Zv
+    v += kappa * dt * theta
+    v -= kappa * dt * v_pos
+    Zv *= sqrt_vdt
+    Zv *= sigma
+    v += Zv
+
+def _heston_qe_step(x, v, Z, U, buffers, mu, kappa, theta, sigma, rho, dt, psi_c=1.5):
+    from scipy.special import ndtri
+
+    m, psi, work, b2, v_new = buffers
+    e = np.exp(-kappa * dt)
+
+    # Conditional mean m and psi = s^2 / m^2 of v(t + dt)
+    np.multiply(v, e, out=m)
+    m += theta * (1 - e)
+    np.multiply(v, sigma ** 2 * e * (1 - e) / kappa, out=psi)
+    psi += theta * sigma ** 2 * (1 - e) ** 2 / (2 * kappa)
+    np.multiply(m, m, out=work)
+    psi /= work
+
+    # Exponential branch (psi > psi_c, usually few paths): point mass at 0 plus exponential tail
+    tail = np.flatnonzero(psi > psi_c)
+    p = (psi[tail] - 1) / (psi[tail] + 1)
+    U_tail = U[tail]
+    v_tail = np.where(U_tail <= p, 0.0, np.log((1 - p) / np.maximum(1 - U_tail, 1e-300)) * m[tail] / (1 - p))
+
+    # Quadratic branch: v' = m / (1 + b^2) (b + Zv)^2, with b^2 = 2/psi - 1 + sqrt(2/psi) sqrt(2/psi - 1)
+    np.divide(2, psi, out=work)
+    np.subtract(work, 1, out=b2)
+    np.maximum(b2, 0, out=b2)
+    work *= b2
+    np.sqrt(work, out=work)
+    b2 += work
+    np.sqrt(b2, out=work)
+    ndtri(U, out=v_new)
+    v_new += work
+    v_new **= 2
+    b2 += 1
+    np.divide(m, b2, out=m)
+    v_new *= m
+    v_new[tail] = v_tail
 
-def price_european_call_mc(S, K, r, T):
-    payoff = np.maximum(S[:, -1] - K, 0)
-    return np.exp(-r * T) * np.mean(payoff)
+    # Central log-spot discretisation (gamma1 = gamma2 = 1/2)
+    K0 = -rho * kappa * theta * dt / sigma
+    K1 = 0.5 * dt * (kappa * rho / sigma - 0.5) - rho / sigma
+    K2 = 0.5 * dt * (kappa * rho / sigma - 0.5) + rho / sigma
+    K3 = K4 = 0.5 * dt * (1 - rho ** 2)
+
+    x += mu * dt + K0
+    x += K1 * v
+    x += K2 * v_new
+    np.multiply(v, K3, out=work)
+    work += K4 * v_new
+    np.sqrt(work, out=work)
+    work *= Z
+    x += work
+
+    v[:] = v_new
+
+
+# Characteristic function of ln(S_T / S_0) under Heston ("little trap" form)
+def heston_char_func(u, T, r, v0, kappa, theta, sigma, rho, q=0.0):
+    iu = 1j * u
+    beta = kappa - rho * sigma * iu
+    d = np.sqrt(beta ** 2 + sigma ** 2 * (iu + u ** 2))
+    g = (beta - d) / (beta + d)
+    exp_dT = np.exp(-d * T)
+    C = (r - q) * iu * T + kappa * theta / sigma ** 2 * ((beta - d) * T - 2 * np.log((1 - g * exp_dT) / (1 - g)))
+    D = (beta - d) / sigma ** 2 * (1 - exp_dT) / (1 - g * exp_dT)
+    return np.exp(C + D * v0)
+
+# Semi-analytic European prices for a whole strike grid (Fang-Oosterlee COS method)
+def heston_price_cos(S0, K, T, r, v0, kappa, theta, sigma, rho, q=0.0, option_type='call', N=512, L=20):
+    """
+    Prices European options on every strike in K for one expiry T in a single
+    (strikes x N) pass. Puts are expanded in cosines (their payoff is bounded)
+    and calls follow from put-call parity. N terms over [c1 - L sqrt(c2),
+    c1 + L sqrt(c2)] (shifted by the strike range) reach ~1e-8 for typical
+    parameters; very fat-tailed cases (large sigma, long T) need a larger N and L.
+    """
+    K = np.asarray(K, dtype=float)
+    x = np.log(S0 / K).ravel()
+
+    # Truncation range from the first two cumulants of ln(S_T / S_0)
+    e = np.exp(-kappa * T)
+    c1 = (r - q) * T + (1 - e) * (theta - v0) / (2 * kappa) - 0.5 * theta * T
+    c2 = 1 / (8 * kappa ** 3) * (
+        sigma * T * kappa * e * (v0 - theta) * (8 * kappa * rho - 4 * sigma)
+        + kappa * rho * sigma * (1 - e) * (16 * theta - 8 * v0)
+        + 2 * theta * kappa * T * (-4 * kappa * rho * sigma + sigma ** 2 + 4 * kappa ** 2)
+        + sigma ** 2 * ((theta - 2 * v0) * e ** 2 + theta * (6 * e - 7) + 2 * v0)
+        + 8 * kappa ** 2 * (v0 - theta) * (1 - e)
+    )
+    # y = ln(S_T / K) = x + ln(S_T / S_0) must stay inside [a, b] for every strike
+    a = x.min() + c1 - L * np.sqrt(abs(c2))
+    b = x.max() + c1 + L * np.sqrt(abs(c2))
+    d = min(b, 0.0)
+
+    k = np.arange(N)
+    u = k * np.pi / (b - a)
+
+    # Put payoff (1 - e^y)^+ coefficients on [a, d]: U_k = 2 / (b - a) * (psi_k - chi_k)
+    chi = (np.cos(u * (d - a)) * np.exp(d) - np.exp(a) + u * np.sin(u * (d - a)) * np.exp(d)) / (1 + u ** 2)
+    psi = np.empty(N)
+    psi[0] = d - a
+    psi[1:] = np.sin(u[1:] * (d - a)) / u[1:]
+    U = 2 / (b - a) * (psi - chi)
+
+    weights = heston_char_func(u, T, r, v0, kappa, theta, sigma, rho, q) * U
+    weights[0] *= 0.5
+    puts = K.ravel() * np.exp(-r * T) * np.real(np.exp(1j * np.outer(x - a, u)) @ weights)
+
+    if option_type == 'call':
+        prices = puts + S0 * np.exp(-q * T) - K.ravel() * np.exp(-r * T)
+    else:
+        prices = puts
+    return prices.reshape(K.shape)[()]
 
 
 # =================== SABR MODEL ===================
 
 def sabr_implied_vol(F, K, T, alpha, beta, rho, nu):
-    """Returns implied vol using Hagan's SABR approximation."""
-    if F == K:
-        term1 = ((1 - beta) ** 2 / 24) * (alpha ** 2) / (F ** (2 - 2 * beta))
-        term2 = (rho * beta * nu * alpha) / (4 * F ** (1 - beta))
-        term3 = (nu ** 2) * (2 - 3 * rho ** 2) / 24
-        return alpha / (F ** (1 - beta)) * (1 + (term1 + term2 + term3) * T)
+    """Returns implied vol using Hagan's SABR approximation (inputs broadcast as arrays)."""
+    F, K, T, alpha, beta, rho, nu = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (F, K, T, alpha, beta, rho, nu)))
 
+    one_beta = 1 - beta
     logFK = np.log(F / K)
-    FK_avg = (F * K) ** ((1 - beta) / 2)
+    FK_avg = (F * K) ** (one_beta / 2)
     z = (nu / alpha) * FK_avg * logFK
-    x_z = np.log((np.sqrt(1 - 2 * rho * z + z ** 2) + z - rho) / (1 - rho))
 
-    one_beta = 1 - beta
+    # z / x(z) -> 1 at the money; use its series there to avoid 0/0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_z = np.log((np.sqrt(1 - 2 * rho * z + z ** 2) + z - rho) / (1 - rho))
+        ratio = np.where(np.abs(z) < 1e-5, 1 - 0.5 * rho * z + (2 - 3 * rho ** 2) * z ** 2 / 12, z / x_z)
+
     A = alpha / (FK_avg * (1 + one_beta ** 2 * logFK ** 2 / 24 + one_beta ** 4 * logFK ** 4 / 1920))
     B1 = (one_beta ** 2 * alpha ** 2) / (24 * (F * K) ** one_beta)
-    B2 = (rho * beta * nu * alpha) / (4 * (F * K) ** ((1 - beta) / 2))
+    B2 = (rho * beta * nu * alpha) / (4 * FK_avg)
     B3 = (2 - 3 * rho ** 2) * nu ** 2 / 24
     B = 1 + (B1 + B2 + B3) * T
 
-    return A * z / x_z * B
+    return (A * ratio * B)[()]
+
+# Model vols for (n_expiries, 3) transformed parameters (log alpha, atanh rho, log nu)
+def _sabr_smiles(params, F, K, T, beta):
+    alpha = np.exp(params[:, 0:1])
+    rho = np.tanh(params[:, 1:2])
+    nu = np.exp(params[:, 2:3])
+    return sabr_implied_vol(F[:, None], K, T[:, None], alpha, beta, rho, nu)
+
+def sabr_calibrate(F, K, T, market_vols, beta=0.5, weights=None, max_iter=100, tol=1e-12):
+    """
+    Fits (alpha, rho, nu) for many expiries at once with a batched
+    Levenberg-Marquardt. F and T have one entry per expiry; K and market_vols
+    are (n_expiries, n_strikes) and may be padded with NaN. The Jacobian is
+    taken by vectorized forward differences over all smiles together.
+    Returns a dict of per-expiry alpha, rho, nu and RMSE.
+    """
+    F = np.atleast_1d(np.asarray(F, dtype=float))
+    T = np.atleast_1d(np.asarray(T, dtype=float))
+    K = np.atleast_2d(np.asarray(K, dtype=float))
+    market_vols = np.atleast_2d(np.asarray(market_vols, dtype=float))
+    mask = np.isfinite(K) & np.isfinite(market_vols)
+    W = np.where(mask, 1.0 if weights is None else np.asarray(weights, dtype=float), 0.0)
+    K = np.where(mask, K, F[:, None])
+    market_vols = np.where(mask, market_vols, 0.0)
+    beta = float(beta)
+    n_exp = len(F)
+
+    def residuals(p):
+        return np.where(mask, _sabr_smiles(p, F, K, T, beta) - market_vols, 0.0) * np.sqrt(W)
+
+    # Start from the quote closest to the money: sigma_ATM ~ alpha / F^(1 - beta)
+    atm = np.argmin(np.where(mask, np.abs(np.log(K / F[:, None])), np.inf), axis=1)
+    atm_vol = market_vols[np.arange(n_exp), atm]
+    params = np.column_stack([np.log(atm_vol * F ** (1 - beta)), np.zeros(n_exp), np.log(np.full(n_exp, 0.5))])
+
+    res = residuals(params)
+    cost = np.sum(res ** 2, axis=1)
+    lam = np.full(n_exp, 1e-3)
+    active = np.ones(n_exp, dtype=bool)
+    h = 1e-7
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        J = np.empty(res.shape + (3,))
+        for j in range(3):
+            bumped = params.copy()
+            bumped[:, j] += h
+            J[:, :, j] = (residuals(bumped) - res) / h
+
+        JTJ = np.einsum('eki,ekj->eij', J, J)
+        grad = np.einsum('eki,ek->ei', J, res)
+        damped = JTJ + lam[:, None, None] * (np.eye(3) * JTJ + 1e-12 * np.eye(3))
+        step = -np.linalg.solve(damped, grad[:, :, None])[:, :, 0]
+        step[~active] = 0.0
+
+        trial = params + step
+        trial_res = residuals(trial)
+        trial_cost = np.sum(trial_res ** 2, axis=1)
+        better = active & (trial_cost < cost)
+
+        improvement = np.where(better, cost - trial_cost, 0.0)
+        params[better] = trial[better]
+        res[better] = trial_res[better]
+        cost[better] = trial_cost[better]
+        lam = np.where(better, lam / 3, lam * 2)
+
+        small_step = np.max(np.abs(step), axis=1) < 1e-10
+        active &= ~((better & (improvement <= tol * (1 + cost))) | small_step | (lam > 1e12))
+
+    errors = np.where(mask, _sabr_smiles(params, F, K, T, beta) - market_vols, 0.0)
+    n_quotes = np.maximum(mask.sum(axis=1), 1)
+    return {
+        "alpha": np.exp(params[:, 0]),
+        "rho": np.tanh(params[:, 1]),
+        "nu": np.exp(params[:, 2]),
+        "rmse": np.sqrt(np.sum(errors ** 2, axis=1) / n_quotes),
+    }
 
 
 # =================== COMBINED INTERFACE ===================
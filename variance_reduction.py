@@ -0,0 +1,121 @@
+import warnings
+
+import numpy as np
+
+from normal_distribution import norm_cdf
+
+METHODS = ("plain", "antithetic", "moment_matching", "sobol")
+
+# =================== NORMAL DRAWS ===================
+
+def standard_normals(n_paths, steps, method="plain", rng=None, factors=1, bridge=True):
+    """
+    Returns standard normal increments of shape (n_paths, steps), or
+    (factors, n_paths, steps) when factors > 1.
+
+    method: 'plain', 'antithetic' (second half of the paths mirrors the first),
+    'moment_matching' (per-step mean 0 / variance 1 across paths) or 'sobol'
+    (scrambled Sobol points, built through a Brownian bridge when bridge=True).
+    With method='plain' and no rng the global np.random state is used.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown variance reduction method: {method!r}")
+
+    shape = (factors, n_paths, steps)
+    if method == "sobol":
+        Z = sobol_normals(n_paths, steps * factors, rng)
+        # Interleave dimensions so every factor gets the low (best) Sobol coordinates
+        Z = Z.reshape(n_paths, steps, factors).transpose(2, 0, 1)
+        if bridge:
+            Z = brownian_bridge(Z)
+    elif method == "antithetic":
+        if n_paths % 2:
+            raise ValueError("Antithetic sampling needs an even number of paths")
+        half = _normal_draws((factors, n_paths // 2, steps), rng)
+        Z = np.concatenate([half, -half], axis=1)
+    else:
+        Z = _normal_draws(shape, rng)
+        if method == "moment_matching":
+            Z = (Z - Z.mean(axis=1, keepdims=True)) / Z.std(axis=1, keepdims=True)
+
+    return Z[0] if factors == 1 else Z
+
+def _normal_draws(shape, rng):
+    if rng is None:
+        return np.random.standard_normal(shape)
+    return rng.standard_normal(shape)
+
+# scipy.stats.qmc costs seconds to import, so it is only loaded for Sobol draws
+def sobol_normals(n_paths, dim, rng=None):
+    from scipy.special import ndtri
+    from scipy.stats import qmc
+
+    sampler = qmc.Sobol(d=dim, scramble=True, seed=rng)
+    with warnings.catch_warnings():
+        # Sobol balance is only exact for powers of two; a prefix is still a valid QMC set
+        warnings.simplefilter("ignore", UserWarning)
+        U = sampler.random(n_paths)
+    return ndtri(np.clip(U, 1e-16, 1 - 1e-16))
+
+# Maps the first coordinates of each row to the coarsest path features:
+# coordinate 0 drives the terminal value, then midpoints are filled recursively
+def brownian_bridge(Z):
+    steps = Z.shape[-1]
+    W = np.zeros(Z.shape[:-1] + (steps + 1,))
+    W[..., steps] = np.sqrt(steps) * Z[..., 0]
+
+    k = 1
+    intervals = [(0, steps)]
+    while intervals:
+        next_intervals = []
+        for left, right in intervals:
+            if right - left < 2:
+                continue
+            mid = (left + right) // 2
+            w_left = (right - mid) / (right - left)
+            w_right = (mid - left) / (right - left)
+            std = np.sqrt((mid - left) * (right - mid) / (right - left))
+            W[..., mid] = w_left * W[..., left] + w_right * W[..., right] + std * Z[..., k]
+            k += 1
+            next_intervals += [(left, mid), (mid, right)]
+        intervals = next_intervals
+
+    # Unit-time increments are standard normal, like the input
+    return np.diff(W, axis=-1)
+
+# =================== ESTIMATORS ===================
+
+# Antithetic pairs are (i, i + n/2); their averages are the i.i.d. samples
+def pair_average(samples):
+    half = len(samples) // 2
+    return 0.5 * (samples[:half] + samples[half:2 * half])
+
+def mc_estimate(samples, antithetic=False):
+    """
+    Mean and standard error of i.i.d. (or antithetic-paired) samples.
+    For a single Sobol set the figure is conservative; use independent
+    scrambles as replicates for a sharp error estimate.
+    """
+    samples = np.asarray(samples, dtype=float)
+    if antithetic:
+        samples = pair_average(samples)
+    return np.mean(samples), np.std(samples, ddof=1) / np.sqrt(len(samples))
+
+def control_variate(Y, X, EX, antithetic=False):
+    """Returns Y - b (X - E[X]) with the variance-minimising coefficient b."""
+    if antithetic:
+        cov = np.cov(pair_average(Y), pair_average(X))
+    else:
+        cov = np.cov(Y, X)
+    b = cov[0, 1] / cov[1, 1] if cov[1, 1] > 0 else 0.0
+    return Y - b * (X - EX)
+
+# Closed form for the discretely monitored geometric-average Asian call
+# (average over the steps monitoring dates after t=0)
+def geometric_asian_call_price(S0, K, r, sigma, T, steps):
+    n = steps
+    mu = np.log(S0) + (r - 0.5 * sigma ** 2) * T * (n + 1) / (2 * n)
+    var = sigma ** 2 * T * (n + 1) * (2 * n + 1) / (6 * n ** 2)
+    d2 = (mu - np.log(K)) / np.sqrt(var)
+    d1 = d2 + np.sqrt(var)
+    return np.exp(-r * T) * (np.exp(mu + 0.5 * var) * norm_cdf(d1) - K * norm_cdf(d2))
@@ -0,0 +1,26 @@
+import contextlib
+import os
+
+# Library functions report their working through report() instead of print(),
+# so batch jobs can silence them. QUANTFINANCE_QUIET=1 starts a process quiet.
+_verbose = os.environ.get("QUANTFINANCE_QUIET", "") in ("", "0")
+
+def set_verbose(flag):
+    global _verbose
+    _verbose = bool(flag)
+
+def is_verbose():
+    return _verbose
+
+@contextlib.contextmanager
+def quiet():
+    previous = _verbose
+    set_verbose(False)
+    try:
+        yield
+    finally:
+        set_verbose(previous)
+
+def report(*args, **kwargs):
+    if _verbose:
+        print(*args, **kwargs)
@@ -1,41 +1,238 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-from scipy.optimize import brentq
-from scipy.stats import norm
+
+from normal_distribution import norm_cdf
 
 # Black-Scholes Call Option Pricing Formula
 def black_scholes_call_price(S, K, T, r, sigma):
     d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
     d2 = d1 - sigma * np.sqrt(T)
-    return S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
+    return S * norm_cdf(d1) - K * np.exp(-r * T) * norm_cdf(d2)
 
 # Implied volatility via root-finding
 def implied_volatility_call(C_market, S, K, T, r):
+    from scipy.optimize import brentq
+
     try:
         return brentq(lambda sigma: black_scholes_call_price(S, K, T, r, sigma) - C_market, 1e-6, 3.0)
     except ValueError:
         return np.nan
 
+# Undiscounted Black price of an out-of-the-money option and its vega, in total
+# standard deviation s = sigma * sqrt(T); calls when is_call else puts
+def _black_otm(F, K, s, is_call):
+    d1 = np.log(F / K) / s + 0.5 * s
+    d2 = d1 - s
+    sign = np.where(is_call, 1.0, -1.0)
+    price = sign * (F * norm_cdf(sign * d1) - K * norm_cdf(sign * d2))
+    vega = F * np.exp(-0.5 * d1 ** 2) / np.sqrt(2 * np.pi)
+    return price, vega
+
+# Vectorized implied volatility for arrays of call and put prices
+def implied_volatility_batch(prices, S, K, T, r, is_call=True, q=0.0, tol=1e-12, max_iter=50):
+    """
+    Inverts Black-Scholes prices quote by quote, all at once. Every quote is
+    mapped to its out-of-the-money equivalent by put-call parity and solved by
+    Newton iterations on the log price, starting from the Corrado-Miller
+    approximation and safeguarded by bisection on a shrinking bracket.
+    Quotes outside the no-arbitrage bounds (or with T <= 0), and quotes not
+    converged within max_iter iterations, give NaN.
+    """
+    prices, S, K, T, r, is_call, q = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (prices, S, K, T, r, is_call, q)))
+    shape = prices.shape
+    prices, S, K, T, r, is_call, q = (x.ravel() for x in (prices, S, K, T, r, is_call, q))
+    is_call = is_call.astype(bool)
+
+    F = S * np.exp((r - q) * T)
+    undiscounted = prices * np.exp(r * T)
+
+    # No-arbitrage bounds: intrinsic <= price < F (call) or K (put)
+    intrinsic = np.where(is_call, np.maximum(F - K, 0), np.maximum(K - F, 0))
+    upper = np.where(is_call, F, K)
+    valid = (T > 0) & (undiscounted >= intrinsic) & (undiscounted < upper) & np.isfinite(undiscounted)
+
+    # Out-of-the-money equivalent: calls for K >= F, puts below
+    otm_call = K >= F
+    target = undiscounted - intrinsic
+
+    sigma = np.full(prices.shape, np.nan)
+    sigma[valid & (target <= 0)] = 0.0
+    idx = np.flatnonzero(valid & (target > 0))
+
+    F_i, K_i, c_i, call_i = F[idx], K[idx], target[idx], otm_call[idx]
+    log_target = np.log(c_i)
+
+    # Corrado-Miller initial guess (in call-price terms), inflection point as fallback
+    call_price = np.where(call_i, c_i, c_i + F_i - K_i)
+    half_moneyness = 0.5 * (F_i - K_i)
+    radicand = (call_price - half_moneyness) ** 2 - (F_i - K_i) ** 2 / np.pi
+    s = np.sqrt(2 * np.pi) / (F_i + K_i) * (call_price - half_moneyness + np.sqrt(np.maximum(radicand, 0)))
+    inflection = np.sqrt(2 * np.abs(np.log(F_i / K_i)))
+    s = np.where((s > 0) & np.isfinite(s), s, np.maximum(inflection, 0.1))
+
+    lo = np.zeros_like(s)
+    hi = np.full_like(s, 20.0)
+    active = np.arange(len(idx))
+    for _ in range(max_iter):
+        if not len(active):
+            break
+        s_a = s[active]
+        price, vega = _black_otm(F_i[active], K_i[active], s_a, call_i[active])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            g = np.log(price) - log_target[active]
+            step = g * price / vega
+
+        too_high = g > 0
+        hi[active] = np.where(too_high, s_a, hi[active])
+        lo[active] = np.where(too_high, lo[active], s_a)
+
+        s_new = s_a - step
+        converged = np.abs(step) <= tol * np.maximum(s_a, 1.0)
+        outside = ~converged & (~np.isfinite(s_new) | (s_new < lo[active]) | (s_new > hi[active]))
+        s[active] = np.where(outside, 0.5 * (lo[active] + hi[active]), s_new)
+        active = active[~converged]
+
+    s[active] = np.nan
+    sigma[idx] = s / np.sqrt(T[idx])
+    return sigma.reshape(shape)
+
 # Generate volatility surface from sample option price grid
 def build_vol_surface(option_data, S, r):
-    strikes = sorted(set([d['K'] for d in option_data]))
-    maturities = sorted(set([d['T'] for d in option_data]))
+    K = np.array([d['K'] for d in option_data], dtype=float)
+    T = np.array([d['T'] for d in option_data], dtype=float)
+    C = np.array([d['C'] for d in option_data], dtype=float)
+
+    # One pass: sorted unique axes and each quote's (row, column) in the grid
+    strikes, col = np.unique(K, return_inverse=True)
+    maturities, row = np.unique(T, return_inverse=True)
+
+    # Duplicate (K, T) quotes: the first one in option_data fills the cell
+    _, first = np.unique(row * len(strikes) + col, return_index=True)
+    IV_surface = np.full((len(maturities), len(strikes)), np.nan)
+    IV_surface[row[first], col[first]] = implied_volatility_batch(C[first], S, K[first], T[first], r, is_call=True)
 
-    IV_surface = np.zeros((len(maturities), len(strikes)))
+    return strikes, maturities, IV_surface
 
-    for i, T in enumerate(maturities):
-        for j, K in enumerate(strikes):
-            match = next((d for d in option_data if d['K'] == K and d['T'] == T), None)
-            if match:
-                IV_surface[i, j] = implied_volatility_call(match['C'], S, K, T, r)
+# =================== INDEXED VOLATILITY SURFACE ===================
+
+class VolSurface:
+    """
+    Implied volatility surface stored as total variance w = iv^2 * T.
+
+    Quotes are indexed by expiry and strike in dictionaries, so building is a
+    single pass and ticks update only the expiries they touch. Each expiry
+    slice is interpolated with a natural cubic spline in log-forward-moneyness
+    (flat beyond the quoted strikes); between expiries total variance is
+    linear in T at fixed moneyness. Splines are cached and rebuilt lazily.
+    """
+
+    def __init__(self, S, r, q=0.0):
+        self.S = S
+        self.r = r
+        self.q = q
+        self._quotes = {}      # T -> {K: total variance}
+        self._slices = {}      # T -> (k_min, k_max, spline), rebuilt when dirty
+        self._dirty = set()
+        self.expiries = np.array([])
+
+    @classmethod
+    def from_quotes(cls, K, T, iv, S, r, q=0.0):
+        surface = cls(S, r, q)
+        surface.update(K, T, iv)
+        return surface
+
+    @classmethod
+    def from_prices(cls, prices, K, T, S, r, is_call=True, q=0.0):
+        iv = implied_volatility_batch(prices, S, K, T, r, is_call, q)
+        return cls.from_quotes(K, T, iv, S, r, q)
+
+    def forward(self, T):
+        return self.S * np.exp((self.r - self.q) * np.asarray(T, dtype=float))
+
+    def update(self, K, T, iv):
+        """Inserts or overwrites quotes; NaN vols are ignored."""
+        K, T, iv = np.broadcast_arrays(*(np.atleast_1d(np.asarray(x, dtype=float)) for x in (K, T, iv)))
+        keep = np.isfinite(iv) & (T > 0)
+        K, T, iv = K[keep], T[keep], iv[keep]
+
+        w = iv ** 2 * T
+        for expiry in np.unique(T):
+            in_slice = T == expiry
+            self._quotes.setdefault(float(expiry), {}).update(zip(K[in_slice].tolist(), w[in_slice].tolist()))
+            self._dirty.add(float(expiry))
+        self.expiries = np.array(sorted(self._quotes))
+
+    def _slice(self, expiry):
+        if expiry in self._dirty or expiry not in self._slices:
+            quotes = self._quotes[expiry]
+            strikes = np.array(sorted(quotes))
+            w = np.array([quotes[K] for K in strikes])
+            k = np.log(strikes / self.forward(expiry))
+            if len(k) == 1:
+                spline = lambda x, w0=w[0]: np.full_like(x, w0)
             else:
-                IV_surface[i, j] = np.nan
+                from scipy.interpolate import CubicSpline
+                spline = CubicSpline(k, w, bc_type='natural')
+            self._slices[expiry] = (k[0], k[-1], spline)
+            self._dirty.discard(expiry)
+        return self._slices[expiry]
+
+    def _slice_variance(self, i, k):
+        k_min, k_max, spline = self._slice(self.expiries[i])
+        return np.maximum(spline(np.clip(k, k_min, k_max)), 0.0)
+
+    # Evaluates slice index[j] at k[j] for every query, one spline call per slice
+    def _slices_variance(self, index, k):
+        # Small-integer keys let numpy use a radix sort
+        order = np.argsort(index.astype(np.int16 if len(self.expiries) < 2 ** 15 else np.int64), kind='stable')
+        bounds = np.searchsorted(index[order], np.arange(len(self.expiries) + 1))
+        w = np.empty_like(k)
+        for i in range(len(self.expiries)):
+            rows = order[bounds[i]:bounds[i + 1]]
+            if len(rows):
+                w[rows] = self._slice_variance(i, k[rows])
+        return w
+
+    def total_variance(self, K, T):
+        K, T = np.broadcast_arrays(np.asarray(K, dtype=float), np.asarray(T, dtype=float))
+        shape = K.shape
+        K, T = K.ravel(), T.ravel()
+        k = np.log(K / self.forward(T))
+        expiries = self.expiries
+        n = len(expiries)
+        if n == 0:
+            raise ValueError("VolSurface has no quotes")
 
-    return np.array(strikes), np.array(maturities), IV_surface
+        # Bracketing expiries (clamped at both ends) and linear weights in T
+        right = np.clip(np.searchsorted(expiries, T), 0, n - 1)
+        left = np.clip(right - 1, 0, n - 1)
+        right = np.where(T <= expiries[0], 0, right)
+        T_left, T_right = expiries[left], expiries[right]
+        span = np.where(right > left, T_right - T_left, 1.0)
+        weight = np.where(right > left, (T - T_left) / span, 1.0)
 
-# Plot surface
+        w_left = self._slices_variance(left, k)
+        w_right = self._slices_variance(right, k)
+        w = (1 - weight) * w_left + weight * w_right
+        # Outside the quoted expiries keep the nearest slice's implied vol
+        w = np.where(T < expiries[0], w_right * T / expiries[0], w)
+        w = np.where(T > expiries[-1], w_right * T / expiries[-1], w)
+        return w.reshape(shape)
+
+    # Implied vol is undefined at T <= 0, as in implied_volatility_batch
+    def iv(self, K, T):
+        T = np.asarray(T, dtype=float)
+        w, T = np.broadcast_arrays(self.total_variance(K, T), T)
+        return np.sqrt(np.divide(w, T, out=np.full(w.shape, np.nan), where=T > 0))
+
+    def grid(self, strikes, maturities):
+        K, T = np.meshgrid(strikes, maturities)
+        return self.iv(K, T)
+
+# Plot surface (matplotlib is only imported here)
 def plot_vol_surface(strikes, maturities, IV_surface):
+    import matplotlib.pyplot as plt
+
     X, Y = np.meshgrid(strikes, maturities)
 
     fig = plt.figure(figsize=(12, 8))